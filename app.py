@@ -6,12 +6,53 @@ from treys import Card, Evaluator, Deck
 import json
 import os
 import random
+from collections import namedtuple
 from datetime import datetime
 
 # Import utility modules
 from utils.poker_utils import card_to_treys, treys_to_card, get_hand_type, get_hand_strength
-from utils.heatmap_utils import load_range_data, create_heatmap, get_action_description, get_exploit_suggestion
+from utils.heatmap_utils import load_range_data, create_heatmap, get_action_description, get_exploit_suggestion, HAND_TO_CELL, POSITIONS, ACTIONS, OPPONENT_TYPES
 from utils.winrate_utils import calculate_win_rate, create_win_rate_chart, get_win_rate_description
+from utils.quiz_utils import load_quiz_table
+
+# Cache range data per (position, action, opponent_type) so reruns triggered by
+# unrelated widget changes don't rebuild the same DataFrame over and over
+@st.cache_data(max_entries=64)
+def _cached_range(position, action, opponent_type):
+    return load_range_data(position, action, opponent_type)
+
+# The heatmap figure is a pure function of the same three strings once the
+# range data is cached, so cache the built figure as well and spare Plotly
+# from reconstructing hundreds of annotation dicts on every rerun
+@st.cache_data(max_entries=64)
+def _cached_heatmap_fig(position, action, opponent_type):
+    return create_heatmap(_cached_range(position, action, opponent_type),
+                          position, action, opponent_type)
+
+# The 標準 baselines are needed on every rerun to compute the exploit delta,
+# whatever opponent is selected; there are only 18, so hold them all once
+@st.cache_resource
+def _std_ranges():
+    return {(p, a): load_range_data(p, a, "標準")
+            for p in POSITIONS for a in ACTIONS}
+
+# Quiz answers for all ~15k (scenario, hand cell) combinations are precomputed
+# offline (scripts/build_quiz_table.py); load the table once per process
+@st.cache_resource
+def _quiz_table():
+    return load_quiz_table()
+
+def _show_heatmap(position, action, opponent_type, use_container_width):
+    # Prefer the pre-rendered PNG (scripts/prerender_heatmaps.py) - far fewer
+    # bytes to the browser than an interactive figure - and fall back to
+    # Plotly when the image is missing
+    png_path = os.path.join("assets", "heatmaps",
+                            f"{position}_{action}_{opponent_type}.png")
+    if os.path.exists(png_path):
+        st.image(png_path, use_container_width=use_container_width)
+    else:
+        st.plotly_chart(_cached_heatmap_fig(position, action, opponent_type),
+                        use_container_width=use_container_width)
 
 # Page configuration
 st.set_page_config(
@@ -21,126 +62,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for a more professional look
-st.markdown("""
-<style>
-    /* Main theme colors */
-    :root {
-        --primary-color: #2c3e50;
-        --secondary-color: #3498db;
-        --accent-color: #e74c3c;
-        --background-color: #f8f9fa;
-        --text-color: #2c3e50;
-    }
-    
-    /* Header styling */
-    h1, h2, h3 {
-        color: var(--primary-color);
-        font-family: 'Helvetica Neue', sans-serif;
-        font-weight: 700;
-    }
-    
-    h1 {
-        border-bottom: 2px solid var(--secondary-color);
-        padding-bottom: 10px;
-        margin-bottom: 20px;
-    }
-    
-    /* Card-like containers */
-    .stCard {
-        background-color: white;
-        border-radius: 8px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        padding: 20px;
-        margin-bottom: 20px;
-    }
-    
-    /* Button styling */
-    .stButton>button {
-        background-color: var(--secondary-color);
-        color: white;
-        border-radius: 4px;
-        border: none;
-        padding: 8px 16px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton>button:hover {
-        background-color: #2980b9;
-        box-shadow: 0 2px 5px rgba(0, 0, 0, 0.2);
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background-color: var(--primary-color);
-    }
-    
-    /* Tooltip styling */
-    .tooltip {
-        position: relative;
-        display: inline-block;
-        border-bottom: 1px dotted #ccc;
-        cursor: help;
-    }
-    
-    .tooltip .tooltiptext {
-        visibility: hidden;
-        width: 200px;
-        background-color: #555;
-        color: #fff;
-        text-align: center;
-        border-radius: 6px;
-        padding: 5px;
-        position: absolute;
-        z-index: 1;
-        bottom: 125%;
-        left: 50%;
-        margin-left: -100px;
-        opacity: 0;
-        transition: opacity 0.3s;
-    }
-    
-    .tooltip:hover .tooltiptext {
-        visibility: visible;
-        opacity: 1;
-    }
-    
-    /* Expander styling */
-    .streamlit-expanderHeader {
-        font-weight: 600;
-        color: var(--primary-color);
-    }
-    
-    /* Table styling */
-    .dataframe {
-        border-collapse: collapse;
-        width: 100%;
-        border-radius: 5px;
-        overflow: hidden;
-    }
-    
-    .dataframe th {
-        background-color: var(--secondary-color);
-        color: white;
-        text-align: left;
-        padding: 12px;
-    }
-    
-    .dataframe td {
-        padding: 12px;
-        border-bottom: 1px solid #ddd;
-    }
-    
-    .dataframe tr:nth-child(even) {
-        background-color: #f2f2f2;
-    }
-    
-    .dataframe tr:hover {
-        background-color: #ddd;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for a more professional look, kept in a static asset and read
+# once per process instead of shipping the literal through every rerun
+@st.cache_resource
+def _css():
+    with open(os.path.join("assets", "styles.css"), encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
+
+st.markdown(_css(), unsafe_allow_html=True)
 
 # Application title with professional styling
 st.markdown("<h1 style='text-align: center;'>FastGTO Light</h1>", unsafe_allow_html=True)
@@ -169,6 +98,13 @@ poker_terms = {
     "エクスプロイト": "相手の弱点を突くための調整戦略。"
 }
 
+# Pre-rendered tooltip spans, one per term, so reruns don't re-interpolate
+# the same HTML over and over
+TOOLTIP_HTML = {
+    term: f'<span class="tooltip">{term}<span class="tooltiptext">{explanation}</span></span>'
+    for term, explanation in poker_terms.items()
+}
+
 # Brief introduction
 st.markdown("""
 <div class="stCard">
@@ -256,413 +192,286 @@ with st.sidebar:
     st.markdown("Version 0.2.1")
     st.markdown("© 2025 All Rights Reserved")
 
-# Simulation Mode Tab
-with tab1:
-    # Define all possible ranks and suits
-    all_ranks = ["A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"]
-    all_suits = ["♠", "♥", "♦", "♣"]
-    
-    # Create tooltips for poker terms
-    def create_tooltip(term, explanation):
-        return f"""<span class="tooltip">{term}<span class="tooltiptext">{explanation}</span></span>"""
-    
-    # Determine layout based on mobile mode
-    if mobile_mode:
-        # Mobile-friendly layout (stacked)
-        # Load range data
-        range_data = load_range_data(position, action, opponent_type)
-        
-        # Heatmap visualization first (as per user's latest feedback)
+# ---------------------------------------------------------------------------
+# Simulation tab renderers
+# The mobile and desktop layouts share the same widgets and analysis logic;
+# only the surrounding column scaffold differs, so everything is rendered
+# through the functions below instead of two duplicated branches.
+# ---------------------------------------------------------------------------
+
+# Widget option tuples, shared by every selectbox so no per-rerun list
+# allocations are needed and the option identity stays stable
+ALL_RANKS = ("A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2")
+ALL_SUITS = ("♠", "♥", "♦", "♣")
+BOARD_RANKS = ("",) + ALL_RANKS
+BOARD_SUITS = ("",) + ALL_SUITS
+
+# For pocket pairs the second card cannot reuse the first card's suit;
+# precompute the four possible option tuples instead of copy-and-remove
+SUITS_EXCLUDING = {s: tuple(x for x in ALL_SUITS if x != s) for s in ALL_SUITS}
+
+# Quiz state lives in one namedtuple: attribute access is cheaper than the
+# previous pair of string-keyed dicts and keeps the scenario and hand together
+QuizState = namedtuple("QuizState",
+                       "position action opponent_type rank1 suit1 rank2 suit2")
+
+def _new_quiz_state():
+    rank1 = random.choice(ALL_RANKS)
+    rank2 = random.choice(ALL_RANKS)
+    suit1 = random.choice(ALL_SUITS)
+    suit2 = random.choice(ALL_SUITS)
+
+    # Ensure the hand is valid (not the same card)
+    while rank1 == rank2 and suit1 == suit2:
+        rank2 = random.choice(ALL_RANKS)
+        suit2 = random.choice(ALL_SUITS)
+
+    return QuizState(random.choice(POSITIONS), random.choice(ACTIONS),
+                     random.choice(OPPONENT_TYPES), rank1, suit1, rank2, suit2)
+
+# Hand-type strings for every (rank1, rank2, suited) combination - a tiny
+# domain, so precompute the table instead of re-deriving per rerun
+HAND_TYPE_TABLE = {
+    (r1, r2, suited): get_hand_type(r1, "♠", r2, "♠" if suited else "♥")
+    for r1 in ALL_RANKS for r2 in ALL_RANKS for suited in (True, False)
+}
+
+# The analysis strings are deterministic in a handful of enum-like inputs;
+# cache them so reruns skip the formatting work
+@st.cache_data(max_entries=1024)
+def _cached_action_desc(hand_type, frequency, position, action):
+    return get_action_description(hand_type, frequency, position, action)
+
+@st.cache_data(max_entries=1024)
+def _cached_exploit_suggestion(hand_type, std_freq, exploit_freq, opponent_type, action):
+    return get_exploit_suggestion(hand_type, std_freq, exploit_freq, opponent_type, action)
+
+@st.fragment
+def render_heatmap(position, action, opponent_type, layout):
+    """Render the range heatmap card and chart.
+
+    Runs as a fragment so widget interactions elsewhere on the page
+    (board cards, sliders) don't re-execute the heatmap rendering.
+    """
+    # Heatmap visualization first (as per user's latest feedback)
+    st.markdown(f"""
+    <div class="stCard">
+        <h2>GTOレンジヒートマップ</h2>
+        <p>
+            {TOOLTIP_HTML["ポジション"]}: <b>{position}</b> | 
+            {TOOLTIP_HTML["アクション"]}: <b>{action}</b> | 
+            {TOOLTIP_HTML["相手タイプ"]}: <b>{opponent_type}</b>
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Fixed width in the stacked (mobile) layout to prevent resizing
+    _show_heatmap(position, action, opponent_type,
+                  use_container_width=(layout == "columns"))
+
+def render_hand_analysis(range_data, std_range_data, position, action, opponent_type):
+    """Render the hand selectors and the GTO/exploit analysis cards.
+
+    Returns the selected hole cards as (rank1, suit1, rank2, suit2).
+    """
+    # Hand input section
+    st.markdown("""
+    <div class="stCard">
+        <h2>ハンド分析</h2>
+        <p>分析したいハンドを選択してください</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col_hand1, col_hand2 = st.columns(2)
+
+    with col_hand1:
+        card1_rank = st.selectbox("1枚目のランク:", ALL_RANKS, key="card1_rank")
+        card1_suit = st.selectbox("1枚目のスート:", ALL_SUITS, key="card1_suit")
+
+    with col_hand2:
+        # For the second card, if the same rank is selected, don't allow the same suit
+        card2_rank = st.selectbox("2枚目のランク:", ALL_RANKS, key="card2_rank")
+
+        # If same rank is selected, exclude the suit already used by the first
+        # card; the precomputed tuples keep option identity stable for diffing
+        available_suits = SUITS_EXCLUDING[card1_suit] if card1_rank == card2_rank else ALL_SUITS
+
+        card2_suit = st.selectbox("2枚目のスート:", available_suits, key="card2_suit")
+
+    # Get hand type
+    suited = card1_suit == card2_suit
+    hand_type = HAND_TYPE_TABLE[(card1_rank, card2_rank, suited)]
+    st.markdown(f"""
+    <div style="background-color: #f0f8ff; padding: 10px; border-radius: 5px; margin: 10px 0;">
+        <h3 style="margin: 0;">選択したハンド: <b>{hand_type}</b></h3>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Look up the matrix cell for this hand (precomputed in heatmap_utils)
+    row_idx, col_idx = HAND_TO_CELL[(card1_rank, card2_rank, suited)]
+
+    # Get frequency from range data via direct 0-based array indexing
+    try:
+        frequency = range_data[row_idx, col_idx]
+
+        # Get standard GTO frequency (without opponent type adjustment)
+        std_frequency = std_range_data[row_idx, col_idx]
+
+        # Display GTO analysis
         st.markdown(f"""
         <div class="stCard">
-            <h2>GTOレンジヒートマップ</h2>
-            <p>
-                {create_tooltip("ポジション", poker_terms["ポジション"])}: <b>{position}</b> | 
-                {create_tooltip("アクション", poker_terms["アクション"])}: <b>{action}</b> | 
-                {create_tooltip("相手タイプ", poker_terms["相手タイプ"])}: <b>{opponent_type}</b>
-            </p>
+            <h3>{TOOLTIP_HTML["GTO"]}戦略分析</h3>
+            <p>{_cached_action_desc(hand_type, frequency, position, action)}</p>
         </div>
         """, unsafe_allow_html=True)
-        
-        # Create heatmap
-        heatmap_fig = create_heatmap(range_data, position, action, opponent_type)
-        st.plotly_chart(heatmap_fig, use_container_width=False)  # Set to False to prevent resizing
-        
-        # Hand input section
-        st.markdown("""
-        <div class="stCard">
-            <h2>ハンド分析</h2>
-            <p>分析したいハンドを選択してください</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col_hand1, col_hand2 = st.columns(2)
-        
-        with col_hand1:
-            card1_rank = st.selectbox("1枚目のランク:", all_ranks, key="card1_rank")
-            card1_suit = st.selectbox("1枚目のスート:", all_suits, key="card1_suit")
-        
-        with col_hand2:
-            # For the second card, if the same rank is selected, don't allow the same suit
-            card2_rank = st.selectbox("2枚目のランク:", all_ranks, key="card2_rank")
-            
-            # If same rank is selected, remove the suit that's already selected for the first card
-            available_suits = all_suits.copy()
-            if card1_rank == card2_rank:
-                if card1_suit in available_suits:
-                    available_suits.remove(card1_suit)
-            
-            card2_suit = st.selectbox("2枚目のスート:", available_suits, key="card2_suit")
-        
-        # Get hand type
-        hand_type = get_hand_type(card1_rank, card1_suit, card2_rank, card2_suit)
-        st.markdown(f"""
-        <div style="background-color: #f0f8ff; padding: 10px; border-radius: 5px; margin: 10px 0;">
-            <h3 style="margin: 0;">選択したハンド: <b>{hand_type}</b></h3>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Convert display ranks to numeric ranks
-        from utils.heatmap_utils import RANK_TO_NUM
-        
-        # Determine row and column in the matrix
-        if card1_rank == card2_rank:  # Pocket pair
-            # For pocket pairs, both row and column are the same rank
-            row_idx = RANK_TO_NUM[card1_rank]
-            col_idx = row_idx
-        else:
-            # Convert display ranks to numeric ranks
-            rank1_num = RANK_TO_NUM[card1_rank]
-            rank2_num = RANK_TO_NUM[card2_rank]
-            
-            # Determine if suited
-            suited = card1_suit == card2_suit
-            
-            if suited:
-                # For suited hands, higher rank is row, lower rank is column
-                if rank1_num > rank2_num:
-                    row_idx, col_idx = rank1_num, rank2_num
-                else:
-                    row_idx, col_idx = rank2_num, rank1_num
-            else:
-                # For offsuit hands, higher rank is column, lower rank is row
-                if rank1_num > rank2_num:
-                    row_idx, col_idx = rank2_num, rank1_num
-                else:
-                    row_idx, col_idx = rank1_num, rank2_num
-        
-        # Get frequency from range data - use .loc instead of .iloc to access by index value, not position
-        try:
-            frequency = range_data.loc[row_idx, col_idx]
-            
-            # Get standard GTO frequency (without opponent type adjustment)
-            std_range_data = load_range_data(position, action, "標準")
-            std_frequency = std_range_data.loc[row_idx, col_idx]
-            
-            # Display GTO analysis
+
+        # Display exploit suggestion if opponent type is not standard
+        if opponent_type != "標準":
             st.markdown(f"""
             <div class="stCard">
-                <h3>{create_tooltip("GTO", poker_terms["GTO"])}戦略分析</h3>
-                <p>{get_action_description(hand_type, frequency, position, action)}</p>
+                <h3>{TOOLTIP_HTML["エクスプロイト"]}提案</h3>
+                <p>{_cached_exploit_suggestion(hand_type, std_frequency, frequency, opponent_type, action)}</p>
             </div>
             """, unsafe_allow_html=True)
-            
-            # Display exploit suggestion if opponent type is not standard
-            if opponent_type != "標準":
-                st.markdown(f"""
-                <div class="stCard">
-                    <h3>{create_tooltip("エクスプロイト", poker_terms["エクスプロイト"])}提案</h3>
-                    <p>{get_exploit_suggestion(hand_type, std_frequency, frequency, opponent_type, action)}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        except Exception as e:
-            st.error(f"有効なハンドを選択してください。エラー: {str(e)}")
-        
-        # Win rate calculator
-        st.header("勝率シミュレーション")
-        
-        # Board input
-        st.subheader("ボード")
-        use_board = st.checkbox("ボードカードを指定", value=False)
-        
-        board_ranks = [""] * 5
-        board_suits = [""] * 5
-        board_cards = []
-        
+    except Exception as e:
+        st.error(f"有効なハンドを選択してください。エラー: {str(e)}")
+
+    return card1_rank, card1_suit, card2_rank, card2_suit
+
+def render_winrate_calculator(card1_rank, card1_suit, card2_rank, card2_suit, simulation_count):
+    """Render the board inputs, opponent slider and win-rate simulation."""
+    # Win rate calculator
+    st.header("勝率シミュレーション")
+
+    # Board input
+    st.subheader("ボード")
+    use_board = st.checkbox("ボードカードを指定", value=False)
+
+    board_ranks = [""] * 5
+    board_suits = [""] * 5
+    board_cards = []
+
+    # Batch the board and opponent inputs into one form so each edit does
+    # not trigger its own full-script rerun; everything lands on submit
+    with st.form("wr_form"):
         if use_board:
             col_board1, col_board2, col_board3 = st.columns(3)
-            
+
             with col_board1:
-                board_ranks[0] = st.selectbox("フロップ1のランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board1_rank")
-                board_suits[0] = st.selectbox("フロップ1のスート:", ["", "♠", "♥", "♦", "♣"], key="board1_suit")
-            
+                board_ranks[0] = st.selectbox("フロップ1のランク:", BOARD_RANKS, key="board1_rank")
+                board_suits[0] = st.selectbox("フロップ1のスート:", BOARD_SUITS, key="board1_suit")
+
             with col_board2:
-                board_ranks[1] = st.selectbox("フロップ2のランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board2_rank")
-                board_suits[1] = st.selectbox("フロップ2のスート:", ["", "♠", "♥", "♦", "♣"], key="board2_suit")
-            
+                board_ranks[1] = st.selectbox("フロップ2のランク:", BOARD_RANKS, key="board2_rank")
+                board_suits[1] = st.selectbox("フロップ2のスート:", BOARD_SUITS, key="board2_suit")
+
             with col_board3:
-                board_ranks[2] = st.selectbox("フロップ3のランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board3_rank")
-                board_suits[2] = st.selectbox("フロップ3のスート:", ["", "♠", "♥", "♦", "♣"], key="board3_suit")
-            
+                board_ranks[2] = st.selectbox("フロップ3のランク:", BOARD_RANKS, key="board3_rank")
+                board_suits[2] = st.selectbox("フロップ3のスート:", BOARD_SUITS, key="board3_suit")
+
             col_board4, col_board5 = st.columns(2)
-            
+
             with col_board4:
-                board_ranks[3] = st.selectbox("ターンのランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board4_rank")
-                board_suits[3] = st.selectbox("ターンのスート:", ["", "♠", "♥", "♦", "♣"], key="board4_suit")
-            
+                board_ranks[3] = st.selectbox("ターンのランク:", BOARD_RANKS, key="board4_rank")
+                board_suits[3] = st.selectbox("ターンのスート:", BOARD_SUITS, key="board4_suit")
+
             with col_board5:
-                board_ranks[4] = st.selectbox("リバーのランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board5_rank")
-                board_suits[4] = st.selectbox("リバーのスート:", ["", "♠", "♥", "♦", "♣"], key="board5_suit")
-            
+                board_ranks[4] = st.selectbox("リバーのランク:", BOARD_RANKS, key="board5_rank")
+                board_suits[4] = st.selectbox("リバーのスート:", BOARD_SUITS, key="board5_suit")
+
             # Create board cards list for description
             for i in range(5):
                 if board_ranks[i] and board_suits[i]:
                     board_cards.append((board_ranks[i], board_suits[i]))
-        
+
         # Opponent count
         st.subheader("対戦相手")
         opponent_count = st.slider("対戦相手数:", 1, 8, 1)
-        
-        # Calculate button
-        if st.button("勝率計算", type="primary"):
-            # Check if we have valid hole cards
-            if card1_rank and card1_suit and card2_rank and card2_suit:
+        submitted = st.form_submit_button("勝率計算", type="primary")
+
+    # Calculate button (form submit)
+    if submitted:
+        # Check if we have valid hole cards
+        if card1_rank and card1_suit and card2_rank and card2_suit:
+            # Reuse the previous result when the inputs haven't changed
+            wr_key = (card1_rank, card1_suit, card2_rank, card2_suit,
+                      tuple(board_ranks), tuple(board_suits),
+                      opponent_count, simulation_count)
+            wr_cache = st.session_state.setdefault("wr_cache", {})
+            win_rate_data = wr_cache.get(wr_key)
+
+            if win_rate_data is None:
                 with st.spinner("計算中..."):
                     # Calculate win rate
                     win_rate_data = calculate_win_rate(
                         card1_rank, card1_suit, card2_rank, card2_suit,
                         board_ranks, board_suits, opponent_count, simulation_count
                     )
-                    
-                    if 'error' in win_rate_data and win_rate_data['error']:
-                        st.error(win_rate_data['error'])
-                    else:
-                        # Display results
-                        st.success("計算完了!")
-                        
-                        # Create and display chart
-                        win_rate_chart = create_win_rate_chart(win_rate_data)
-                        st.plotly_chart(win_rate_chart, use_container_width=True)
-                        
-                        # Display description
-                        st.markdown(get_win_rate_description(
-                            win_rate_data, card1_rank, card1_suit, card2_rank, card2_suit,
-                            opponent_count, board_cards
-                        ))
+
+                if not ('error' in win_rate_data and win_rate_data['error']):
+                    wr_cache[wr_key] = win_rate_data
+                    # Bound the cache, dropping the oldest entries first
+                    while len(wr_cache) > 16:
+                        wr_cache.pop(next(iter(wr_cache)))
+
+            if 'error' in win_rate_data and win_rate_data['error']:
+                st.error(win_rate_data['error'])
             else:
-                st.error("ホールカードを入力してください。")
+                # Display results
+                st.success("計算完了!")
+
+                # Create and display chart
+                win_rate_chart = create_win_rate_chart(win_rate_data)
+                st.plotly_chart(win_rate_chart, use_container_width=True)
+
+                # Display description
+                st.markdown(get_win_rate_description(
+                    win_rate_data, card1_rank, card1_suit, card2_rank, card2_suit,
+                    opponent_count, board_cards
+                ))
+        else:
+            st.error("ホールカードを入力してください。")
+
+def render_simulation(layout):
+    """Render the whole simulation tab in the given layout ("stacked" or "columns")."""
+    # Load range data
+    range_data = _cached_range(position, action, opponent_type)
+    std_range_data = _std_ranges()[(position, action)]
+
+    if layout == "stacked":
+        # Mobile-friendly layout (stacked)
+        render_heatmap(position, action, opponent_type, layout)
+        hole_cards = render_hand_analysis(range_data, std_range_data, position, action, opponent_type)
+        render_winrate_calculator(*hole_cards, simulation_count)
     else:
-        # Desktop layout (side by side)
-        # Load range data
-        range_data = load_range_data(position, action, opponent_type)
-        
         # Desktop layout (side by side)
         col1, col2 = st.columns([3, 2])
-        
-        # Column 1: Heatmap visualization first (as per user's latest feedback)
+
         with col1:
-            st.markdown(f"""
-            <div class="stCard">
-                <h2>GTOレンジヒートマップ</h2>
-                <p>
-                    {create_tooltip("ポジション", poker_terms["ポジション"])}: <b>{position}</b> | 
-                    {create_tooltip("アクション", poker_terms["アクション"])}: <b>{action}</b> | 
-                    {create_tooltip("相手タイプ", poker_terms["相手タイプ"])}: <b>{opponent_type}</b>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Create heatmap
-            heatmap_fig = create_heatmap(range_data, position, action, opponent_type)
-            st.plotly_chart(heatmap_fig, use_container_width=True)
-        
-        # Column 2: Hand input and analysis
+            render_heatmap(position, action, opponent_type, layout)
+
         with col2:
-            # Hand input section
-            st.markdown("""
-            <div class="stCard">
-                <h2>ハンド分析</h2>
-                <p>分析したいハンドを選択してください</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col_hand1, col_hand2 = st.columns(2)
-            
-            with col_hand1:
-                card1_rank = st.selectbox("1枚目のランク:", all_ranks, key="card1_rank")
-                card1_suit = st.selectbox("1枚目のスート:", all_suits, key="card1_suit")
-            
-            with col_hand2:
-                # For the second card, if the same rank is selected, don't allow the same suit
-                card2_rank = st.selectbox("2枚目のランク:", all_ranks, key="card2_rank")
-                
-                # If same rank is selected, remove the suit that's already selected for the first card
-                available_suits = all_suits.copy()
-                if card1_rank == card2_rank:
-                    if card1_suit in available_suits:
-                        available_suits.remove(card1_suit)
-                
-                card2_suit = st.selectbox("2枚目のスート:", available_suits, key="card2_suit")
-            
-            # Get hand type
-            hand_type = get_hand_type(card1_rank, card1_suit, card2_rank, card2_suit)
-            st.markdown(f"""
-            <div style="background-color: #f0f8ff; padding: 10px; border-radius: 5px; margin: 10px 0;">
-                <h3 style="margin: 0;">選択したハンド: <b>{hand_type}</b></h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Convert display ranks to numeric ranks
-            from utils.heatmap_utils import RANK_TO_NUM
-            
-            # Determine row and column in the matrix
-            if card1_rank == card2_rank:  # Pocket pair
-                # For pocket pairs, both row and column are the same rank
-                row_idx = RANK_TO_NUM[card1_rank]
-                col_idx = row_idx
-            else:
-                # Convert display ranks to numeric ranks
-                rank1_num = RANK_TO_NUM[card1_rank]
-                rank2_num = RANK_TO_NUM[card2_rank]
-                
-                # Determine if suited
-                suited = card1_suit == card2_suit
-                
-                if suited:
-                    # For suited hands, higher rank is row, lower rank is column
-                    if rank1_num > rank2_num:
-                        row_idx, col_idx = rank1_num, rank2_num
-                    else:
-                        row_idx, col_idx = rank2_num, rank1_num
-                else:
-                    # For offsuit hands, higher rank is column, lower rank is row
-                    if rank1_num > rank2_num:
-                        row_idx, col_idx = rank2_num, rank1_num
-                    else:
-                        row_idx, col_idx = rank1_num, rank2_num
-            
-            # Get frequency from range data
-            try:
-                frequency = range_data.loc[row_idx, col_idx]
-                
-                # Get standard GTO frequency (without opponent type adjustment)
-                std_range_data = load_range_data(position, action, "標準")
-                std_frequency = std_range_data.loc[row_idx, col_idx]
-                
-                # Display GTO analysis
-                st.markdown(f"""
-                <div class="stCard">
-                    <h3>{create_tooltip("GTO", poker_terms["GTO"])}戦略分析</h3>
-                    <p>{get_action_description(hand_type, frequency, position, action)}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Display exploit suggestion if opponent type is not standard
-                if opponent_type != "標準":
-                    st.markdown(f"""
-                    <div class="stCard">
-                        <h3>{create_tooltip("エクスプロイト", poker_terms["エクスプロイト"])}提案</h3>
-                        <p>{get_exploit_suggestion(hand_type, std_frequency, frequency, opponent_type, action)}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            except Exception as e:
-                st.error(f"有効なハンドを選択してください。エラー: {str(e)}")
-            
-            # Win rate calculator
-            st.header("勝率シミュレーター")
-            
-            # Board input
-            st.subheader("ボード")
-            use_board = st.checkbox("ボードカードを指定", value=False)
-            
-            board_ranks = [""] * 5
-            board_suits = [""] * 5
-            board_cards = []
-            
-            if use_board:
-                col_board1, col_board2, col_board3 = st.columns(3)
-                
-                with col_board1:
-                    board_ranks[0] = st.selectbox("フロップ1のランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board1_rank")
-                    board_suits[0] = st.selectbox("フロップ1のスート:", ["", "♠", "♥", "♦", "♣"], key="board1_suit")
-                
-                with col_board2:
-                    board_ranks[1] = st.selectbox("フロップ2のランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board2_rank")
-                    board_suits[1] = st.selectbox("フロップ2のスート:", ["", "♠", "♥", "♦", "♣"], key="board2_suit")
-                
-                with col_board3:
-                    board_ranks[2] = st.selectbox("フロップ3のランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board3_rank")
-                    board_suits[2] = st.selectbox("フロップ3のスート:", ["", "♠", "♥", "♦", "♣"], key="board3_suit")
-                                
-                col_board4, col_board5 = st.columns(2)
-                
-                with col_board4:
-                    board_ranks[3] = st.selectbox("ターンのランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board4_rank")
-                    board_suits[3] = st.selectbox("ターンのスート:", ["", "♠", "♥", "♦", "♣"], key="board4_suit")
-                
-                with col_board5:
-                    board_ranks[4] = st.selectbox("リバーのランク:", ["", "A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"], key="board5_rank")
-                    board_suits[4] = st.selectbox("リバーのスート:", ["", "♠", "♥", "♦", "♣"], key="board5_suit")
-                
-                # Create board cards list for description
-                for i in range(5):
-                    if board_ranks[i] and board_suits[i]:
-                        board_cards.append((board_ranks[i], board_suits[i]))
-            
-            # Opponent count
-            st.subheader("対戦相手")
-            opponent_count = st.slider("対戦相手数:", 1, 8, 1)
-            
-            # Calculate button
-            if st.button("勝率計算", type="primary"):
-                # Check if we have valid hole cards
-                if card1_rank and card1_suit and card2_rank and card2_suit:
-                    with st.spinner("計算中..."):
-                        # Calculate win rate
-                        win_rate_data = calculate_win_rate(
-                            card1_rank, card1_suit, card2_rank, card2_suit,
-                            board_ranks, board_suits, opponent_count, simulation_count
-                        )
-                        
-                        if 'error' in win_rate_data and win_rate_data['error']:
-                            st.error(win_rate_data['error'])
-                        else:
-                            # Display results
-                            st.success("計算完了!")
-                            
-                            # Create and display chart
-                            win_rate_chart = create_win_rate_chart(win_rate_data)
-                            st.plotly_chart(win_rate_chart, use_container_width=True)
-                            
-                            # Display description
-                            st.markdown(get_win_rate_description(
-                                win_rate_data, card1_rank, card1_suit, card2_rank, card2_suit,
-                                opponent_count, board_cards
-                            ))
-                else:
-                    st.error("ホールカードを入力してください。")
+            hole_cards = render_hand_analysis(range_data, std_range_data, position, action, opponent_type)
+            render_winrate_calculator(*hole_cards, simulation_count)
+
+# Simulation Mode Tab
+with tab1:
+    render_simulation("stacked" if mobile_mode else "columns")
 
 # Quiz Mode Tab
 with tab2:
     st.header("ポーカー戦略クイズ")
     st.markdown("ランダムなシナリオでポーカー戦略を学習しましょう。正解と解説で理解を深めることができます。")
     
-    # Generate random scenario
-    if 'quiz_scenario' not in st.session_state:
-        positions = ["UTG", "MP", "CO", "BTN", "SB", "BB"]
-        actions = ["Open", "Call", "3Bet"]
-        opponent_types = ["標準", "タイト", "ルーズ", "パッシブ", "アグレッシブ"]
-        
-        st.session_state.quiz_scenario = {
-            "position": random.choice(positions),
-            "action": random.choice(actions),
-            "opponent_type": random.choice(opponent_types)
-        }
+    # Generate random scenario and hand
+    if 'quiz' not in st.session_state:
+        st.session_state.quiz = _new_quiz_state()
     
     # Display scenario
-    scenario_pos = st.session_state.quiz_scenario["position"]
-    scenario_action = st.session_state.quiz_scenario["action"]
-    scenario_opp = st.session_state.quiz_scenario["opponent_type"]
+    quiz = st.session_state.quiz
+    scenario_pos = quiz.position
+    scenario_action = quiz.action
+    scenario_opp = quiz.opponent_type
     
     st.subheader("シナリオ")
     
@@ -677,36 +486,11 @@ with tab2:
     **相手タイプ**: {scenario_opp}
     """)
     
-    # Load range data for this scenario
-    quiz_range_data = load_range_data(scenario_pos, scenario_action, scenario_opp)
-    
-    # Generate random hand for quiz
-    if 'quiz_hand' not in st.session_state:
-        ranks = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
-        suits = ["♠", "♥", "♦", "♣"]
-        
-        rank1 = random.choice(ranks)
-        rank2 = random.choice(ranks)
-        suit1 = random.choice(suits)
-        suit2 = random.choice(suits)
-        
-        # Ensure the hand is valid (not the same card)
-        while rank1 == rank2 and suit1 == suit2:
-            rank2 = random.choice(ranks)
-            suit2 = random.choice(suits)
-        
-        st.session_state.quiz_hand = {
-            "rank1": rank1,
-            "suit1": suit1,
-            "rank2": rank2,
-            "suit2": suit2
-        }
-    
     # Display the hand
-    quiz_rank1 = st.session_state.quiz_hand["rank1"]
-    quiz_suit1 = st.session_state.quiz_hand["suit1"]
-    quiz_rank2 = st.session_state.quiz_hand["rank2"]
-    quiz_suit2 = st.session_state.quiz_hand["suit2"]
+    quiz_rank1 = quiz.rank1
+    quiz_suit1 = quiz.suit1
+    quiz_rank2 = quiz.rank2
+    quiz_suit2 = quiz.suit2
     
     st.markdown(f"### あなたのハンド: **{quiz_rank1}{quiz_suit1} {quiz_rank2}{quiz_suit2}**")
     
@@ -723,56 +507,16 @@ with tab2:
     # Check answer button
     if st.button("回答を確認", type="primary"):
         # Get the correct GTO play
-        hand_type = get_hand_type(quiz_rank1, quiz_suit1, quiz_rank2, quiz_suit2)
-        
-        # Convert display ranks to numeric ranks
-        from utils.heatmap_utils import RANK_TO_NUM
-        
-        # Determine row and column in the matrix
-        if quiz_rank1 == quiz_rank2:  # Pocket pair
-            # For pocket pairs, both row and column are the same rank
-            row_idx = RANK_TO_NUM[quiz_rank1]
-            col_idx = row_idx
-        else:
-            # Convert display ranks to numeric ranks
-            rank1_num = RANK_TO_NUM[quiz_rank1]
-            rank2_num = RANK_TO_NUM[quiz_rank2]
-            
-            # Determine if suited
-            suited = quiz_suit1 == quiz_suit2
-            
-            if suited:
-                # For suited hands, higher rank is row, lower rank is column
-                if rank1_num > rank2_num:
-                    row_idx, col_idx = rank1_num, rank2_num
-                else:
-                    row_idx, col_idx = rank2_num, rank1_num
-            else:
-                # For offsuit hands, higher rank is column, lower rank is row
-                if rank1_num > rank2_num:
-                    row_idx, col_idx = rank2_num, rank1_num
-                else:
-                    row_idx, col_idx = rank1_num, rank2_num
+        suited = quiz_suit1 == quiz_suit2
+        hand_type = HAND_TYPE_TABLE[(quiz_rank1, quiz_rank2, suited)]
         
-        # Get frequency from range data
-        frequency = quiz_range_data.iloc[row_idx, col_idx]
+        # Look up the matrix cell for this hand (precomputed in heatmap_utils)
+        row_idx, col_idx = HAND_TO_CELL[(quiz_rank1, quiz_rank2, suited)]
         
-        # Determine correct answer based on frequency
-        correct_answer = ""
-        if scenario_action == "Open" or scenario_action == "3Bet":
-            if frequency >= 0.7:
-                correct_answer = "Raise/Bet"
-            elif frequency >= 0.3:
-                correct_answer = "Call"  # Mixed strategy
-            else:
-                correct_answer = "Fold"
-        else:  # Call
-            if frequency >= 0.7:
-                correct_answer = "Call"
-            elif frequency >= 0.3:
-                correct_answer = "Call"  # Mixed strategy
-            else:
-                correct_answer = "Fold"
+        # Look up the precomputed correct answer and frequency
+        correct_answer, frequency = _quiz_table()[
+            (scenario_pos, scenario_action, scenario_opp, row_idx, col_idx)
+        ]
         
         # Display result
         if answer == correct_answer:
@@ -782,19 +526,18 @@ with tab2:
         
         # Explanation
         st.markdown("### 解説")
-        st.markdown(get_action_description(hand_type, frequency, scenario_pos, scenario_action))
+        st.markdown(_cached_action_desc(hand_type, frequency, scenario_pos, scenario_action))
         
         # Show heatmap for reference
         st.subheader("参考: レンジヒートマップ")
-        quiz_heatmap = create_heatmap(quiz_range_data, scenario_pos, scenario_action, scenario_opp)
-        st.plotly_chart(quiz_heatmap, use_container_width=False)  # Set to False to prevent resizing
+        _show_heatmap(scenario_pos, scenario_action, scenario_opp,
+                      use_container_width=False)  # Set to False to prevent resizing
         
         # New quiz button
         if st.button("新しいクイズ"):
             # Reset session state to generate new quiz
-            del st.session_state.quiz_scenario
-            del st.session_state.quiz_hand
-            st.experimental_rerun()
+            del st.session_state.quiz
+            st.rerun()
 
 
 # Footer
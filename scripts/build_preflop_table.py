@@ -0,0 +1,54 @@
+"""
+Build the binary snapshot of preflop equities.
+
+There are only 169 strategically distinct starting hands (13 pairs, 78
+suited, 78 offsuit) and the opponent count is capped at 9, so every
+preflop query the app can receive fits in a (13, 13, 9, 2) table of win
+and tie probabilities. Simulating each bucket once offline lets
+calculate_win_rate answer empty-board queries with a single table read.
+The app falls back to Monte Carlo when the snapshot is missing.
+
+Usage: python scripts/build_preflop_table.py [simulations_per_bucket]
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.winrate_utils import _run_monte_carlo, PREFLOP_TABLE_PATH, preflop_cell
+from utils.poker_utils import card_to_treys, RANK_MAP_REVERSE
+
+MAX_OPPONENTS = 9
+DEFAULT_SIMULATIONS = 100_000
+
+def main():
+    num_simulations = (int(sys.argv[1]) if len(sys.argv) > 1
+                       else DEFAULT_SIMULATIONS)
+    table = np.zeros((13, 13, MAX_OPPONENTS, 2), dtype=np.float32)
+
+    # One representative hand per bucket; preflop equity is suit-symmetric
+    hands = []
+    for hi in range(14, 1, -1):
+        for lo in range(hi, 1, -1):
+            rank1 = RANK_MAP_REVERSE[hi]
+            rank2 = RANK_MAP_REVERSE[lo]
+            hands.append((rank1, '♠', rank2, '♥'))  # Pair or offsuit
+            if hi != lo:
+                hands.append((rank1, '♠', rank2, '♠'))  # Suited
+
+    for n, (rank1, suit1, rank2, suit2) in enumerate(hands, start=1):
+        hole = [card_to_treys(rank1, suit1), card_to_treys(rank2, suit2)]
+        row, col = preflop_cell(rank1, suit1, rank2, suit2)
+        for num_opponents in range(1, MAX_OPPONENTS + 1):
+            result = _run_monte_carlo(hole, [], num_opponents, num_simulations)
+            table[row, col, num_opponents - 1] = (result['win'], result['tie'])
+        print(f"[{n}/{len(hands)}] {rank1}{suit1} {rank2}{suit2}")
+
+    os.makedirs(os.path.dirname(PREFLOP_TABLE_PATH), exist_ok=True)
+    np.save(PREFLOP_TABLE_PATH, table)
+    print(f"Wrote table of shape {table.shape} to {PREFLOP_TABLE_PATH}")
+
+if __name__ == "__main__":
+    main()
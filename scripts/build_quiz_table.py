@@ -0,0 +1,27 @@
+"""
+Build the precomputed quiz answer table.
+
+Iterates every (position, action, opponent_type, row, col) combination and
+stores the correct answer and action frequency in assets/quiz_answers.pkl,
+so the app can answer quiz questions with a single dict lookup instead of
+loading range data and re-evaluating thresholds on each rerun.
+
+Usage: python scripts/build_quiz_table.py
+"""
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.quiz_utils import build_quiz_table, QUIZ_TABLE_PATH
+
+def main():
+    table = build_quiz_table()
+    os.makedirs(os.path.dirname(QUIZ_TABLE_PATH), exist_ok=True)
+    with open(QUIZ_TABLE_PATH, "wb") as f:
+        pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Wrote {len(table)} entries to {QUIZ_TABLE_PATH}")
+
+if __name__ == "__main__":
+    main()
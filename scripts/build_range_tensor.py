@@ -0,0 +1,39 @@
+"""
+Build the binary snapshot of every range table.
+
+Stacks all 90 range tables (6 positions x 3 actions x 5 opponent types)
+into a single (6, 3, 5, 13, 13) tensor saved as assets/ranges.npy, so
+load_range_data can serve any table with one array slice instead of
+re-running the Python construction loops. The app falls back to building
+tables in-process when the snapshot is missing.
+
+Usage: python scripts/build_range_tensor.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.heatmap_utils import (_build_range_data, RANGE_TENSOR_PATH,
+                                 POSITIONS, ACTIONS, OPPONENT_TYPES)
+
+def main():
+    tensor = np.stack([
+        np.stack([
+            np.stack([
+                _build_range_data(position, action, opponent_type)
+                for opponent_type in OPPONENT_TYPES
+            ])
+            for action in ACTIONS
+        ])
+        for position in POSITIONS
+    ])
+    os.makedirs(os.path.dirname(RANGE_TENSOR_PATH), exist_ok=True)
+    # float32 is plenty for two-decimal frequencies and halves the asset
+    np.save(RANGE_TENSOR_PATH, tensor.astype(np.float32))
+    print(f"Wrote tensor of shape {tensor.shape} to {RANGE_TENSOR_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Pre-render every range heatmap to a static PNG.
+
+There are only 90 distinct heatmaps (6 positions x 3 actions x 5 opponent
+types). Rendering them once at build time lets the app serve a small image
+instead of shipping a full interactive Plotly figure on every rerun. The
+app falls back to Plotly for any combination whose PNG is missing.
+
+Uses Plotly + `kaleido` for image export when available, otherwise falls
+back to a matplotlib rendering of the same grid.
+
+Usage: python scripts/prerender_heatmaps.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.heatmap_utils import (load_range_data, create_heatmap,
+                                 HAND_TYPE_MATRIX, DISPLAY_RANKS,
+                                 POSITIONS, ACTIONS, OPPONENT_TYPES)
+
+HEATMAP_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets", "heatmaps"
+)
+
+# Matches the Plotly colorscale in create_heatmap
+_COLOR_STOPS = [
+    (0.00, (40, 40, 40)),
+    (0.16, (60, 60, 140)),
+    (0.33, (80, 120, 180)),
+    (0.50, (60, 160, 120)),
+    (0.67, (180, 160, 60)),
+    (0.84, (220, 120, 60)),
+    (1.00, (200, 50, 50)),
+]
+
+def _render_matplotlib(range_data, position, action, opponent_type, path):
+    """Render one heatmap PNG with matplotlib (no kaleido required)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LinearSegmentedColormap
+
+    cmap = LinearSegmentedColormap.from_list(
+        "gto", [(stop, tuple(c / 255 for c in rgb)) for stop, rgb in _COLOR_STOPS]
+    )
+
+    z = range_data[::-1, ::-1]  # Reverse both axes, as in create_heatmap
+    fig, ax = plt.subplots(figsize=(7, 7), dpi=200)
+    ax.imshow(z, cmap=cmap, vmin=0.0, vmax=1.0)
+
+    for i in range(13):
+        for j in range(13):
+            freq = z[i, j]
+            color = "white" if freq < 0.3 or freq > 0.7 else "black"
+            label = HAND_TYPE_MATRIX[12 - i, 12 - j]
+            text = f"{label}\n{freq:.0%}" if freq > 0 else label
+            ax.text(j, i, text, ha="center", va="center",
+                    color=color, fontsize=6)
+
+    ticks = range(13)
+    tick_labels = DISPLAY_RANKS[::-1]
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(tick_labels)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels(tick_labels)
+    ax.set_title(f"{position}ポジションからの{action}レンジ (相手: {opponent_type})")
+
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+def main():
+    try:
+        import kaleido  # noqa: F401  (Plotly's image export engine)
+        use_plotly = True
+    except ImportError:
+        print("kaleido not installed; rendering with matplotlib instead")
+        use_plotly = False
+
+    os.makedirs(HEATMAP_DIR, exist_ok=True)
+    count = 0
+    for position in POSITIONS:
+        for action in ACTIONS:
+            for opponent_type in OPPONENT_TYPES:
+                range_data = load_range_data(position, action, opponent_type)
+                path = os.path.join(
+                    HEATMAP_DIR, f"{position}_{action}_{opponent_type}.png"
+                )
+                if use_plotly:
+                    fig = create_heatmap(range_data, position, action, opponent_type)
+                    fig.write_image(path, scale=2)
+                else:
+                    _render_matplotlib(range_data, position, action,
+                                       opponent_type, path)
+                count += 1
+    print(f"Wrote {count} heatmaps to {HEATMAP_DIR}")
+
+if __name__ == "__main__":
+    main()
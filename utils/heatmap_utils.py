@@ -1,4 +1,5 @@
-import pandas as pd
+import functools
+
 import numpy as np
 import plotly.graph_objects as go
 import json
@@ -7,11 +8,95 @@ import os
 # Define mappings between numeric ranks and display ranks
 # Numeric ranks: 2-14 (2=2, 3=3, ..., 10=T, 11=J, 12=Q, 13=K, 14=A)
 # Display ranks: '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A'
+# All supported scenario parameters for load_range_data
+POSITIONS = ["UTG", "MP", "CO", "BTN", "SB", "BB"]
+ACTIONS = ["Open", "Call", "3Bet"]
+OPPONENT_TYPES = ["標準", "タイト", "ルーズ", "パッシブ", "アグレッシブ"]
+
 NUMERIC_RANKS = list(range(2, 15))  # 2-14
 DISPLAY_RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
 RANK_TO_NUM = {r: n for r, n in zip(DISPLAY_RANKS, NUMERIC_RANKS)}
 NUM_TO_RANK = {n: r for r, n in zip(DISPLAY_RANKS, NUMERIC_RANKS)}
 
+# Precomputed (rank1, rank2, suited) -> 0-based (row, col) index into the
+# 13x13 range array. Pairs sit on the diagonal, suited hands in the lower
+# triangle (higher rank first) and offsuit hands in the upper triangle,
+# matching the layout produced by load_range_data.
+HAND_TO_CELL = {}
+for _r1 in DISPLAY_RANKS:
+    for _r2 in DISPLAY_RANKS:
+        _n1, _n2 = RANK_TO_NUM[_r1], RANK_TO_NUM[_r2]
+        for _suited in (True, False):
+            if _n1 == _n2:
+                _cell = (_n1 - 2, _n2 - 2)
+            elif _suited:
+                _cell = (max(_n1, _n2) - 2, min(_n1, _n2) - 2)
+            else:
+                _cell = (min(_n1, _n2) - 2, max(_n1, _n2) - 2)
+            HAND_TO_CELL[(_r1, _r2, _suited)] = _cell
+del _r1, _r2, _n1, _n2, _suited, _cell
+
+# Static hand-type labels ("AA", "AKs", "AKo", ...) on the numeric-rank grid;
+# cell (i, j) labels the hand at ranks (i+2, j+2). The labels never change,
+# so build them once instead of re-formatting 169 strings per heatmap
+HAND_TYPE_MATRIX = np.empty((13, 13), dtype=object)
+for _i, _n1 in enumerate(NUMERIC_RANKS):
+    for _j, _n2 in enumerate(NUMERIC_RANKS):
+        if _n1 == _n2:  # Pocket pair
+            HAND_TYPE_MATRIX[_i, _j] = NUM_TO_RANK[_n1] * 2
+        elif _n1 > _n2:  # Suited (higher rank first)
+            HAND_TYPE_MATRIX[_i, _j] = f"{NUM_TO_RANK[_n1]}{NUM_TO_RANK[_n2]}s"
+        else:  # Offsuit
+            HAND_TYPE_MATRIX[_i, _j] = f"{NUM_TO_RANK[_n2]}{NUM_TO_RANK[_n1]}o"
+del _i, _j, _n1, _n2
+
+# Binary snapshot of every range table, shape (position, action, opponent
+# type, 13, 13), built by scripts/build_range_tensor.py. Loading one array
+# slice is far cheaper than re-running the construction loops below. The
+# snapshot is stored as float32 (frequencies need at most two decimals),
+# halving the asset; loading restores the exact decimal grid so threshold
+# comparisons like freq >= 0.7 behave identically to the built tables.
+RANGE_TENSOR_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets", "ranges.npy"
+)
+POS_IDX = {p: i for i, p in enumerate(POSITIONS)}
+ACT_IDX = {a: i for i, a in enumerate(ACTIONS)}
+OPP_IDX = {o: i for i, o in enumerate(OPPONENT_TYPES)}
+
+# Numeric-rank coordinate grids for vectorized range construction; _ROW[i, j]
+# and _COL[i, j] hold the row and column rank of matrix cell (i, j)
+_ROW, _COL = np.meshgrid(NUMERIC_RANKS, NUMERIC_RANKS, indexing="ij")
+
+_range_tensor = None
+
+def _load_range_tensor():
+    """Lazily load the range tensor snapshot, or None if it is missing"""
+    global _range_tensor
+    if _range_tensor is None and os.path.exists(RANGE_TENSOR_PATH):
+        # Round the float32 values back onto the exact decimal grid
+        _range_tensor = np.round(np.load(RANGE_TENSOR_PATH).astype(np.float64), 4)
+    return _range_tensor
+
+@functools.lru_cache(maxsize=128)
+def _range_array(position, action, opponent_type):
+    """Return the (cached, read-only) 13x13 frequency array for a scenario
+
+    There are only 90 distinct combinations, so the cache saturates after
+    the first pass and every later call is a plain dict hit.
+    """
+    # Serve from the binary snapshot when it covers this combination
+    arr = None
+    if position in POS_IDX and action in ACT_IDX and opponent_type in OPP_IDX:
+        tensor = _load_range_tensor()
+        if tensor is not None:
+            arr = tensor[POS_IDX[position], ACT_IDX[action], OPP_IDX[opponent_type]]
+    if arr is None:
+        arr = _build_range_data(position, action, opponent_type)
+    arr = arr.copy()
+    arr.setflags(write=False)  # Shared across callers; guard against mutation
+    return arr
+
 def load_range_data(position, action, opponent_type="標準"):
     """
     Load range data for a specific position and action
@@ -22,257 +107,246 @@ def load_range_data(position, action, opponent_type="標準"):
     - opponent_type: Opponent type for exploit adjustments
     
     Returns:
-    - DataFrame with hand frequencies
+    - Read-only (13, 13) ndarray of hand frequencies; cell (i, j) holds the
+      frequency for numeric ranks (i+2, j+2)
     """
+    arr = RANGE_TABLES.get((position, action, opponent_type))
+    if arr is None:
+        # Combination outside the precomputed set (e.g. the default branch)
+        arr = _range_array(position, action, opponent_type)
+    return arr
+
+def _utg_open():
+    """UTG Open Range (tight)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # Pocket pairs: 77+
+    mat[(R == C) & (R >= 7)] = 1.0
+
+    # Broadway hands: suited combinations of A, K, Q, J
+    mat[(R >= 11) & (C >= 11) & (R > C)] = 1.0
+
+    # Suited Aces: A8s+
+    mat[(R == 14) & (C >= 8) & (C <= 11)] = 0.8
+    return mat
+
+def _mp_open():
+    """MP Open Range (medium)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # Pocket pairs: 55+
+    mat[(R == C) & (R >= 5)] = 1.0
+
+    # Broadway hands: suited combinations down to T
+    mat[(R >= 11) & (C >= 10) & (R > C)] = 1.0
+
+    # Suited Aces and Kings
+    mat[(R == 14) & (C >= 6) & (C <= 9)] = 0.9
+    mat[(R == 13) & (C >= 7) & (C <= 9)] = 0.5
+    return mat
+
+def _co_open():
+    """CO Open Range (medium-loose)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # All pocket pairs
+    mat[R == C] = 1.0
+
+    # Broadway hands: suited combinations of the top 5 ranks
+    mat[(R >= 10) & (C >= 10) & (R > C)] = 1.0
+
+    # Suited connectors and one-gappers
+    mat[(R == C + 1) & (C >= 3) & (C <= 8)] = 1.0
+    mat[(R == C + 2) & (C >= 3) & (C <= 7)] = 0.7
+
+    # Suited Aces
+    mat[(R == 14) & (C >= 5) & (C <= 9)] = 1.0
+    return mat
+
+def _btn_open():
+    """BTN Open Range (loose)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # Almost all hands with some frequency
+    mat[R == C] = 1.0                                            # Pocket pairs
+    suited = R > C
+    mat[suited] = np.where((R >= 6) | (C >= 9), 1.0, 0.7)[suited]
+    offsuit = R < C
+    mat[offsuit] = np.where((R >= 9) | (C >= 11), 0.9, 0.5)[offsuit]
+    return mat
+
+def _sb_open():
+    """SB Open Range (polarized)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # Strong hands: the top 6 ranks
+    top6 = (R >= 9) & (C >= 9)
+    mat[top6 & (R == C)] = 1.0                                   # Pocket pairs
+    mat[top6 & (R > C)] = 1.0                                    # Suited
+    offsuit = top6 & (R < C)
+    mat[offsuit] = np.where(R >= 11, 0.9, 0.6)[offsuit]
+
+    # Medium pocket pairs
+    mat[(R == C) & (R >= 5) & (R <= 8)] = 0.9
+
+    # Suited Aces
+    mat[(R == 14) & (C <= 8)] = 0.8
+    return mat
+
+def _bb_call():
+    """BB Call Range (vs BTN open)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # Most hands with some frequency
+    pairs = R == C
+    mat[pairs] = np.where(R <= 10, 0.9, 0.3)[pairs]              # Small-medium pairs
+    suited = R > C
+    mat[suited] = np.where((R >= 7) | (C >= 10), 0.9, 0.6)[suited]
+    offsuit = R < C
+    mat[offsuit] = np.where((R >= 10) | (C >= 12), 0.7, 0.3)[offsuit]
+    return mat
+
+def _bb_3bet():
+    """BB 3Bet Range (vs BTN open)"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    # Strong hands: the top 3 ranks
+    top3 = (R >= 12) & (C >= 12)
+    mat[top3 & (R == C)] = 1.0                                   # Pocket pairs
+    mat[top3 & (R > C)] = 0.9                                    # Suited
+    mat[top3 & (R < C)] = 0.8                                    # Offsuit
+
+    # Strong pocket pairs
+    mat[(R == C) & (R >= 8) & (R <= 11)] = 0.8
+
+    # Some bluffs
+    mat[(R == C + 1) & (C >= 4) & (C <= 8)] = 0.3                # Suited connectors
+    mat[(R == C + 2) & (C >= 4) & (C <= 8)] = 0.2                # Offsuit connectors
+    return mat
+
+def _default_range():
+    """Default medium-strength range for unspecified scenarios"""
+    mat = np.zeros((13, 13))
+    R, C = _ROW, _COL
+
+    pairs = R == C
+    mat[pairs] = np.where(R >= 6, 1.0, 0.5)[pairs]               # Pocket pairs
+    suited = R > C
+    mat[suited] = np.where((R >= 9) | (C >= 11), 0.8, 0.3)[suited]
+    offsuit = R < C
+    mat[offsuit] = np.where((R >= 11) & (C >= 13), 0.6, 0.0)[offsuit]
+    return mat
+
+# One builder per defined scenario; anything else falls back to the default.
+# A dict lookup replaces the old top-to-bottom string-comparison ladder
+RANGE_BUILDERS = {
+    ("UTG", "Open"): _utg_open,
+    ("MP", "Open"): _mp_open,
+    ("CO", "Open"): _co_open,
+    ("BTN", "Open"): _btn_open,
+    ("SB", "Open"): _sb_open,
+    ("BB", "Call"): _bb_call,
+    ("BB", "3Bet"): _bb_3bet,
+}
+
+def _build_range_data(position, action, opponent_type="標準"):
+    """Construct a range table from scratch (snapshot fallback and builder)"""
     # Default range data (simplified for MVP)
     # In a real implementation, this would load from a database or file
-    
-    # Create a base matrix of zeros using numeric ranks (2-14)
-    # We'll convert to display ranks when showing the heatmap
-    # Use 0.0 to initialize with float64 dtype to avoid warnings when setting float values later
-    range_data = pd.DataFrame(0.0, index=NUMERIC_RANKS, columns=NUMERIC_RANKS)
-    
-    # Define some basic ranges based on position and action
-    # These are simplified approximations
-    ranks = NUMERIC_RANKS  # Use numeric ranks for calculations
-    
-    # UTG Open Range (tight)
-    if position == "UTG" and action == "Open":
-        # Pocket pairs
-        for rank in ranks:
-            if rank >= 7:  # 77+ (pairs 77 and higher)
-                range_data.loc[rank, rank] = 1.0
-        
-        # Broadway hands
-        for rank1 in ranks[-4:]:  # A, K, Q, J (highest 4 ranks)
-            for rank2 in ranks[-4:]:  # A, K, Q, J
-                if rank1 != rank2:  # Not the same rank
-                    if rank1 > rank2:  # Suited (higher rank first)
-                        range_data.loc[rank1, rank2] = 1.0
-                    else:  # Offsuit
-                        range_data.loc[rank2, rank1] = 0.7 if rank2 >= 13 else 0.0  # K or higher
-        
-        # Suited Aces
-        for rank in [8, 9, 10, 11]:  # 8, 9, T, J (Ace is 14)
-            range_data.loc[14, rank] = 0.8  # A8s+
-    
-    # MP Open Range (medium)
-    elif position == "MP" and action == "Open":
-        # Pocket pairs
-        for rank in ranks:
-            if rank >= 5:  # 55+ (pairs 55 and higher)
-                range_data.loc[rank, rank] = 1.0
-        
-        # Broadway hands
-        for rank1 in ranks[-4:]:  # A, K, Q, J (highest 4 ranks)
-            for rank2 in ranks[-5:]:  # A, K, Q, J, T (highest 5 ranks)
-                if rank1 != rank2 and rank2 >= 10:  # Not the same rank, T or higher
-                    if rank1 > rank2:  # Suited (higher rank first)
-                        range_data.loc[rank1, rank2] = 1.0
-                    else:  # Offsuit
-                        range_data.loc[rank2, rank1] = 0.8 if rank2 >= 12 else 0.3  # Q or higher
-        
-        # Suited Aces and Kings
-        for rank in [6, 7, 8, 9]:  # 6, 7, 8, 9
-            range_data.loc[14, rank] = 0.9  # Suited Aces
-            range_data.loc[13, rank] = 0.5 if rank >= 7 else 0.0  # Suited Kings
-    
-    # CO Open Range (medium-loose)
-    elif position == "CO" and action == "Open":
-        # Pocket pairs
-        for rank in ranks:
-            range_data.loc[rank, rank] = 1.0
-        
-        # Broadway hands
-        for rank1 in ranks[-5:]:  # A, K, Q, J, T (highest 5 ranks)
-            for rank2 in ranks[-5:]:  # A, K, Q, J, T
-                if rank1 != rank2:  # Not the same rank
-                    if rank1 > rank2:  # Suited (higher rank first)
-                        range_data.loc[rank1, rank2] = 1.0
-                    else:  # Offsuit
-                        range_data.loc[rank2, rank1] = 0.9
-        
-        # Suited connectors and one-gappers
-        for i in range(3, 9):  # 4 to 10
-            range_data.loc[i+1, i] = 1.0  # Suited connectors
-            if i < 8:
-                range_data.loc[i+2, i] = 0.7  # Suited one-gappers
-        
-        # Suited Aces
-        for rank in [5, 6, 7, 8, 9]:  # 5, 6, 7, 8, 9
-            range_data.loc[14, rank] = 1.0  # Suited Aces
-    
-    # BTN Open Range (loose)
-    elif position == "BTN" and action == "Open":
-        # Almost all hands with some frequency
-        for rank1 in ranks:
-            for rank2 in ranks:
-                if rank1 == rank2:  # Pocket pairs
-                    range_data.loc[rank1, rank2] = 1.0
-                elif rank1 > rank2:  # Suited (higher rank first)
-                    range_data.loc[rank1, rank2] = 1.0 if rank1 >= 6 or rank2 >= 9 else 0.7
-                else:  # Offsuit
-                    range_data.loc[rank1, rank2] = 0.9 if rank1 >= 9 or rank2 >= 11 else 0.5
-    
-    # SB Open Range (polarized)
-    elif position == "SB" and action == "Open":
-        # Strong hands
-        for rank1 in ranks[-6:]:  # A, K, Q, J, T, 9 (highest 6 ranks)
-            for rank2 in ranks[-6:]:  # A, K, Q, J, T, 9
-                if rank1 == rank2:  # Pocket pairs
-                    range_data.loc[rank1, rank2] = 1.0
-                elif rank1 > rank2:  # Suited (higher rank first)
-                    range_data.loc[rank1, rank2] = 1.0
-                else:  # Offsuit
-                    range_data.loc[rank1, rank2] = 0.9 if rank1 >= 11 else 0.6  # J or higher
-        
-        # Medium pocket pairs
-        for rank in range(5, 9):  # 5, 6, 7, 8
-            range_data.loc[rank, rank] = 0.9
-        
-        # Suited Aces
-        for rank in [2, 3, 4, 5, 6, 7, 8]:  # 2 to 8
-            range_data.loc[14, rank] = 0.8  # Suited Aces
-    
-    # BB Call Range (vs BTN open)
-    elif position == "BB" and action == "Call":
-        # Most hands with some frequency
-        for rank1 in ranks:
-            for rank2 in ranks:
-                if rank1 == rank2:  # Pocket pairs
-                    range_data.loc[rank1, rank2] = 0.9 if rank1 <= 10 else 0.3  # Small-medium pairs
-                elif rank1 > rank2:  # Suited (higher rank first)
-                    range_data.loc[rank1, rank2] = 0.9 if rank1 >= 7 or rank2 >= 10 else 0.6
-                else:  # Offsuit
-                    range_data.loc[rank1, rank2] = 0.7 if rank1 >= 10 or rank2 >= 12 else 0.3
-    
-    # BB 3Bet Range (vs BTN open)
-    elif position == "BB" and action == "3Bet":
-        # Strong hands
-        for rank1 in ranks[-3:]:  # A, K, Q (highest 3 ranks)
-            for rank2 in ranks[-3:]:  # A, K, Q
-                if rank1 == rank2:  # Pocket pairs
-                    range_data.loc[rank1, rank2] = 1.0
-                elif rank1 > rank2:  # Suited (higher rank first)
-                    range_data.loc[rank1, rank2] = 0.9
-                else:  # Offsuit
-                    range_data.loc[rank1, rank2] = 0.8
-        
-        # Strong pocket pairs
-        for rank in range(8, 12):  # 8, 9, T, J
-            range_data.loc[rank, rank] = 0.8
-        
-        # Some bluffs
-        for i in range(4, 9):  # 4 to 9
-            range_data.loc[i+1, i] = 0.3  # Suited connectors
-            range_data.loc[i+2, i] = 0.2  # Offsuit connectors
-    
-    # Default to a reasonable range if not specified
-    else:
-        # Medium-strength range
-        for rank1 in ranks:
-            for rank2 in ranks:
-                if rank1 == rank2:  # Pocket pairs
-                    range_data.loc[rank1, rank2] = 1.0 if rank1 >= 6 else 0.5
-                elif rank1 > rank2:  # Suited (higher rank first)
-                    range_data.loc[rank1, rank2] = 0.8 if rank1 >= 9 or rank2 >= 11 else 0.3
-                else:  # Offsuit
-                    range_data.loc[rank1, rank2] = 0.6 if rank1 >= 11 and rank2 >= 13 else 0.0
-    
+    builder = RANGE_BUILDERS.get((position, action), _default_range)
+    mat = builder()
+
     # Apply opponent type adjustments
     if opponent_type != "標準":
-        range_data = adjust_for_opponent_type(range_data, opponent_type, position, action)
-    
-    return range_data
+        mat = adjust_for_opponent_type(mat, opponent_type, position, action)
+
+    return mat
+
+def _build_delta_masks():
+    """Precompute the per-(opponent type, action) frequency adjustments
+
+    Every opponent adjustment adds one constant to a fixed region of the
+    matrix, so the whole correction collapses to range + delta, clipped.
+    """
+    masks = {}
+    R, C = _ROW, _COL
+
+    # タイト: open wider with medium suited hands, 3bet broadways harder
+    delta = np.zeros((13, 13))
+    delta[(R >= 7) & (R <= 11) & (C >= 5) & (C <= 9) & (R > C)] = 0.2
+    masks[("タイト", "Open")] = delta
+
+    delta = np.zeros((13, 13))
+    top4 = (R >= 11) & (C >= 11)
+    delta[top4 & (R > C)] = 0.3                                  # Suited
+    delta[top4 & (R < C)] = 0.2                                  # Offsuit
+    masks[("タイト", "3Bet")] = delta
+
+    # ルーズ: tighten marginal opens, call more with strong hands
+    delta = np.zeros((13, 13))
+    low = (R >= 2) & (R <= 9) & (C >= 2) & (C <= 7)
+    delta[low & (R > C)] = -0.3                                  # Suited
+    delta[low & (R < C)] = -0.5                                  # Offsuit
+    masks[("ルーズ", "Open")] = delta
+
+    delta = np.zeros((13, 13))
+    delta[(R >= 10) & (C >= 10) & (R != C)] = 0.2
+    masks[("ルーズ", "Call")] = delta
+
+    # パッシブ: bluff more with suited connectors
+    delta = np.zeros((13, 13))
+    delta[(R == C + 1) & (C >= 4) & (C <= 9)] = 0.3
+    masks[("パッシブ", "Open")] = delta
+    masks[("パッシブ", "3Bet")] = delta
+
+    # アグレッシブ: drop marginal hands, stay strong
+    delta = np.zeros((13, 13))
+    delta[(R >= 2) & (R <= 10) & (C >= 2) & (C <= 8) & (R > C)] = -0.4
+    masks[("アグレッシブ", "Open")] = delta
+
+    delta = np.zeros((13, 13))
+    delta[(R != C) & (np.maximum(R, C) <= 11)] = -0.3            # Medium strength hands
+    masks[("アグレッシブ", "Call")] = delta
+
+    return masks
+
+DELTA_MASKS = _build_delta_masks()
 
 def adjust_for_opponent_type(range_data, opponent_type, position, action):
     """
     Adjust range data based on opponent type
     
     Parameters:
-    - range_data: Original range data DataFrame
+    - range_data: Original (13, 13) range array on numeric-rank axes
     - opponent_type: Opponent type (タイト, ルーズ, パッシブ, アグレッシブ)
     - position: Player position
     - action: Action type
     
     Returns:
-    - Adjusted range data DataFrame
+    - Adjusted (13, 13) range array
     """
-    # Use numeric ranks (2-14)
-    ranks = NUMERIC_RANKS
-    adjusted_data = range_data.copy()
-    
-    if opponent_type == "タイト":
-        # Against tight players, we can open wider and 3bet more
-        if action == "Open":
-            # Increase frequency for medium-strength hands
-            for rank1 in range(7, 12):  # 7, 8, 9, T, J
-                for rank2 in range(5, 10):  # 5, 6, 7, 8, 9
-                    if rank1 > rank2:  # Suited (higher rank first)
-                        adjusted_data.loc[rank1, rank2] = min(1.0, range_data.loc[rank1, rank2] + 0.2)
-        
-        elif action == "3Bet":
-            # Increase 3bet frequency for strong hands
-            for rank1 in ranks[-4:]:  # A, K, Q, J
-                for rank2 in ranks[-4:]:  # A, K, Q, J
-                    if rank1 != rank2:
-                        if rank1 > rank2:  # Suited (higher rank first)
-                            adjusted_data.loc[rank1, rank2] = min(1.0, range_data.loc[rank1, rank2] + 0.3)
-                        else:  # Offsuit
-                            adjusted_data.loc[rank1, rank2] = min(1.0, range_data.loc[rank1, rank2] + 0.2)
-    
-    elif opponent_type == "ルーズ":
-        # Against loose players, we tighten up opening but call and 3bet more
-        if action == "Open":
-            # Decrease frequency for marginal hands
-            for rank1 in range(2, 10):  # 2 to 9
-                for rank2 in range(2, 8):  # 2 to 7
-                    if rank1 != rank2:  # Not pocket pairs
-                        if rank1 > rank2:  # Suited (higher rank first)
-                            adjusted_data.loc[rank1, rank2] = max(0.0, range_data.loc[rank1, rank2] - 0.3)
-                        else:  # Offsuit
-                            adjusted_data.loc[rank1, rank2] = max(0.0, range_data.loc[rank1, rank2] - 0.5)
-        
-        elif action == "Call":
-            # Increase call frequency for strong hands
-            for rank1 in ranks[-5:]:  # A, K, Q, J, T
-                for rank2 in ranks[-5:]:  # A, K, Q, J, T
-                    if rank1 != rank2:
-                        adjusted_data.loc[rank1, rank2] = min(1.0, range_data.loc[rank1, rank2] + 0.2)
-    
-    elif opponent_type == "パッシブ":
-        # Against passive players, we can bluff more
-        if action == "Open" or action == "3Bet":
-            # Increase frequency for speculative hands
-            for i in range(4, 10):  # 4 to 9
-                for j in range(i+1, min(i+4, 13)):  # Connected and one/two-gappers
-                    if i+1 == j:  # Suited connectors
-                        adjusted_data.loc[j, i] = min(1.0, range_data.loc[j, i] + 0.3)
-    
-    elif opponent_type == "アグレッシブ":
-        # Against aggressive players, we tighten up and play stronger hands
-        if action == "Open":
-            # Decrease frequency for marginal hands
-            for rank1 in range(2, 11):  # 2 to T
-                for rank2 in range(2, 9):  # 2 to 8
-                    if rank1 > rank2:  # Offsuit
-                        adjusted_data.loc[rank1, rank2] = max(0.0, range_data.loc[rank1, rank2] - 0.4)
-        
-        elif action == "Call":
-            # Decrease call frequency, increase 3bet frequency
-            for rank1 in ranks:
-                for rank2 in ranks:
-                    if rank1 != rank2 and ((rank1 > rank2 and rank1 <= 11) or (rank1 < rank2 and rank2 <= 11)):  # Medium strength hands
-                        adjusted_data.loc[rank1, rank2] = max(0.0, range_data.loc[rank1, rank2] - 0.3)
-    
-    return adjusted_data
+    delta = DELTA_MASKS.get((opponent_type, action))
+    if delta is None:
+        return range_data.copy()
+
+    # Keep adjusted frequencies on the same decimal grid as the base tables
+    # (0.6 - 0.5 would otherwise land on 0.0999...), so the in-process
+    # builder and the float32 snapshot serve identical values
+    return np.round(np.clip(range_data + delta, 0.0, 1.0), 4)
 
 def create_heatmap(range_data, position, action, opponent_type="標準"):
     """
     Create a Plotly heatmap visualization from range data
     
     Parameters:
-    - range_data: DataFrame with hand frequencies
+    - range_data: (13, 13) ndarray of hand frequencies on numeric-rank axes
     - position: Player position
     - action: Action type
     - opponent_type: Opponent type
@@ -281,12 +355,12 @@ def create_heatmap(range_data, position, action, opponent_type="標準"):
     - Plotly figure object
     """
     # Convert numeric ranks to display ranks for visualization
-    display_tickvals = range_data.columns[::-1]  # Reverse for display
+    display_tickvals = NUMERIC_RANKS[::-1]  # Reverse for display
     display_ticktext = [NUM_TO_RANK[n] for n in display_tickvals]  # Convert to A, K, Q, etc.
     
     # Create the heatmap with more gradation levels
     fig = go.Figure(data=go.Heatmap(
-        z=range_data.values[::-1, ::-1],  # Reverse both rows and columns
+        z=range_data[::-1, ::-1],  # Reverse both rows and columns
         x=display_tickvals,  # Numeric ranks (reversed)
         y=display_tickvals,  # Numeric ranks (reversed)
         colorscale=[
@@ -334,57 +408,43 @@ def create_heatmap(range_data, position, action, opponent_type="標準"):
         font=dict(size=12)  # Increase font size
     )
     
-    # Add annotations for hand types - adjust for reversed indices
-    reversed_rows = range_data.index[::-1]
-    reversed_cols = range_data.columns[::-1]
-    
-    for i, row in enumerate(reversed_rows):
-        for j, col in enumerate(reversed_cols):
-            # Find the corresponding indices in the original dataframe
-            orig_i = len(range_data.index) - 1 - i
-            orig_j = len(range_data.columns) - 1 - j
-            
-            # Convert numeric ranks to display ranks
-            row_display = NUM_TO_RANK[row]
-            col_display = NUM_TO_RANK[col]
-            
-            # Determine hand type
-            if row == col:  # Pocket pair
-                hand_type = f"{row_display}{row_display}"
-            elif row > col:  # Suited (higher rank first)
-                hand_type = f"{row_display}{col_display}s"
-            else:  # Offsuit
-                hand_type = f"{col_display}{row_display}o"
-            
-            # Add hand type and frequency text
-            freq = range_data.iloc[orig_i, orig_j]
-            
+    # Add annotations for hand types. Collect every annotation into one list
+    # and attach it with a single layout assignment: each add_annotation call
+    # rebuilds the layout's annotation tuple, which is quadratic in the
+    # number of cells
+    annotations = []
+    # Extract all frequencies as Python floats up front; pulling ndarray
+    # scalars one by one inside the loop is noticeably slower
+    freq_rows = range_data.tolist()
+    # Decide every cell's text color in one vectorized pass
+    color_rows = np.where((range_data < 0.3) | (range_data > 0.7),
+                          "white", "black").tolist()
+    for i, row in enumerate(NUMERIC_RANKS):
+        freq_row = freq_rows[i]
+        color_row = color_rows[i]
+        for j, col in enumerate(NUMERIC_RANKS):
+            # Hand-type labels are static; look them up instead of formatting
+            hand_type = HAND_TYPE_MATRIX[i, j]
+
+            freq = freq_row[j]
+            font_color = color_row[j]
+
             # Always show hand type, even if frequency is 0
-            fig.add_annotation(
-                x=col,
-                y=row,
-                text=hand_type,
-                showarrow=False,
-                font=dict(
-                    color="white" if freq < 0.3 or freq > 0.7 else "black",
-                    size=10
-                )
-            )
-            
+            annotations.append(dict(
+                x=col, y=row, text=hand_type, showarrow=False,
+                font=dict(color=font_color, size=10)
+            ))
+
             # Add frequency text below hand type if frequency > 0
             if freq > 0:
-                fig.add_annotation(
-                    x=col,
-                    y=row,
-                    text=f"{freq:.0%}",
-                    showarrow=False,
-                    font=dict(
-                        color="white" if freq < 0.3 or freq > 0.7 else "black",
-                        size=8
-                    ),
+                annotations.append(dict(
+                    x=col, y=row, text=f"{freq:.0%}", showarrow=False,
+                    font=dict(color=font_color, size=8),
                     yshift=-10  # Shift down to avoid overlapping with hand type
-                )
-    
+                ))
+
+    fig.update_layout(annotations=annotations)
+
     return fig
 
 def get_action_description(hand_type, frequency, position, action):
@@ -440,3 +500,10 @@ def get_exploit_suggestion(hand_type, std_freq, exploit_freq, opponent_type, act
             return f"{opponent_type}相手には{hand_type}を{action}レンジから除外すべきです。"
         else:
             return f"{opponent_type}相手には{hand_type}の{action}頻度を下げるべきです（{std_freq:.0%}→{exploit_freq:.0%}）。"
+
+# Every range table the UI can ask for, specialized once at import time so a
+# render-time load is a single dict hit with no branch dispatch at all
+RANGE_TABLES = {
+    (p, a, o): _range_array(p, a, o)
+    for p in POSITIONS for a in ACTIONS for o in OPPONENT_TYPES
+}
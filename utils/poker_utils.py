@@ -1,3 +1,5 @@
+import itertools
+
 import numpy as np
 from treys import Card, Evaluator, Deck
 import pandas as pd
@@ -9,6 +11,16 @@ RANK_MAP = {
 
 RANK_MAP_REVERSE = {v: k for k, v in RANK_MAP.items()}
 
+# The 52-card treys deck as an array, fetched once instead of per simulation.
+# treys card ints fit comfortably in 32 bits, which halves the size of the
+# batched deal matrix
+_FULL_DECK = np.array(Deck.GetFullDeck(), dtype=np.int32)
+
+# Evaluator.__init__ builds treys' hand-rank lookup tables; pay that once per
+# process (pool workers included, via their own import) and share the
+# instance. It is never mutated after construction
+_EVALUATOR = Evaluator()
+
 SUIT_MAP = {
     '♠': 's', '♥': 'h', '♦': 'd', '♣': 'c'
 }
@@ -17,30 +29,40 @@ SUIT_MAP_REVERSE = {
     's': '♠', 'h': '♥', 'd': '♦', 'c': '♣'
 }
 
-# Treys card conversion utilities
+# Treys card conversion utilities. The domain is just 52 cards, so both
+# directions are precomputed; Card.new parses its string argument on every
+# call otherwise
+_CARD_CACHE = {
+    (rank, suit): Card.new(rank + suit_char)
+    for rank in RANK_MAP
+    for suit, suit_char in SUIT_MAP.items()
+}
+_CARD_CACHE_REVERSE = {card: rank_suit for rank_suit, card in _CARD_CACHE.items()}
+
 def card_to_treys(rank, suit):
     """Convert a card's rank and suit to treys Card integer representation"""
     if not rank or not suit:
         return None
     
-    suit_char = SUIT_MAP.get(suit, suit.lower())
-    return Card.new(rank + suit_char)
+    card = _CARD_CACHE.get((rank, suit))
+    if card is None:  # Unusual spelling (e.g. ascii suit letter)
+        card = Card.new(rank + SUIT_MAP.get(suit, suit.lower()))
+    return card
 
 def treys_to_card(card_int):
     """Convert a treys Card integer back to rank and suit"""
     if card_int is None:
         return None, None
     
-    card_str = Card.int_to_str(card_int)
-    rank = card_str[0]
-    suit_char = card_str[1]
-    suit = SUIT_MAP_REVERSE.get(suit_char, suit_char)
-    
-    return rank, suit
+    rank_suit = _CARD_CACHE_REVERSE.get(card_int)
+    if rank_suit is None:
+        card_str = Card.int_to_str(card_int)
+        return card_str[0], SUIT_MAP_REVERSE.get(card_str[1], card_str[1])
+    return rank_suit
 
 # Hand type utilities
-def generate_hand_matrix():
-    """Generate a 13x13 matrix of all possible starting hands"""
+def _build_hand_matrix():
+    """Build the 13x13 matrix of all possible starting hands"""
     ranks = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
     
     # Create empty matrix
@@ -62,6 +84,13 @@ def generate_hand_matrix():
     
     return pd.DataFrame(hand_matrix, index=ranks, columns=ranks)
 
+# The matrix is static, so build it once at import and share it
+HAND_MATRIX_DF = _build_hand_matrix()
+
+def generate_hand_matrix():
+    """Return the 13x13 matrix of all possible starting hands (shared)"""
+    return HAND_MATRIX_DF
+
 def get_hand_type(card1_rank, card1_suit, card2_rank, card2_suit):
     """Determine the hand type (e.g., 'AKs', 'QJo', '88')"""
     if card1_rank == card2_rank:
@@ -82,8 +111,8 @@ def get_hand_type(card1_rank, card1_suit, card2_rank, card2_suit):
     else:
         return f"{high_rank}{low_rank}o"  # Offsuit
 
-def get_hand_strength(hand_type):
-    """Get a numerical strength value for a hand type (for sorting)"""
+def _compute_hand_strength(hand_type):
+    """Compute the numerical strength value for a hand type"""
     if len(hand_type) == 2:  # Pocket pair
         rank = hand_type[0]
         return 13 * 13 - (13 - RANK_MAP.get(rank, 0)) * 13
@@ -101,52 +130,136 @@ def get_hand_strength(hand_type):
     else:
         return 13 * high_value + low_value - 50  # Penalty for offsuit
 
-def monte_carlo_simulation(hole_cards, board_cards, num_opponents, num_simulations):
+# Strengths for the full 169-hand domain, computed once at import
+HAND_STRENGTH = {
+    hand: _compute_hand_strength(hand)
+    for hand in HAND_MATRIX_DF.values.ravel()
+}
+
+def get_hand_strength(hand_type):
+    """Get a numerical strength value for a hand type (for sorting)"""
+    strength = HAND_STRENGTH.get(hand_type)
+    if strength is None:  # Unknown string; fall back to the computation
+        strength = _compute_hand_strength(hand_type)
+    return strength
+
+def _exact_river_heads_up(hole_cards, board, remaining, evaluator):
+    """
+    Enumerate every opponent hand on a complete board (heads-up fast path)
+
+    Parameters:
+    - hole_cards: List of two treys Card integers for the hero
+    - board: List of five treys Card integers
+    - remaining: Array of treys Card integers the opponent can hold
+    - evaluator: Shared treys Evaluator
+
+    Returns:
+    - Dictionary with exact win, tie, and loss probabilities and counts
+    """
+    evaluate = evaluator.evaluate
+    player_score = evaluate(board, hole_cards)
+
+    wins = 0
+    ties = 0
+    total = 0
+    for opponent_hole in itertools.combinations(remaining.tolist(), 2):
+        opponent_score = evaluate(board, list(opponent_hole))
+        if player_score < opponent_score:
+            wins += 1
+        elif player_score == opponent_score:
+            ties += 1
+        total += 1
+
+    win_prob = wins / total
+    tie_prob = ties / total
+
+    return {
+        'win': win_prob,
+        'tie': tie_prob,
+        'loss': 1 - win_prob - tie_prob,
+        'win_count': wins,
+        'tie_count': ties,
+        'loss_count': total - wins - ties,
+        'simulations': total
+    }
+
+def monte_carlo_simulation(hole_cards, board_cards, num_opponents, num_simulations, seed=None,
+                           evaluator=None):
     """
     Run Monte Carlo simulation to calculate win probability
-    
+
     Parameters:
     - hole_cards: List of treys Card integers [card1, card2]
     - board_cards: List of treys Card integers [card1, card2, ...] (can be empty)
     - num_opponents: Number of opponents
     - num_simulations: Number of simulations to run
-    
+    - seed: Optional seed for the random generator (used by parallel workers)
+    - evaluator: Optional treys Evaluator; defaults to the module-wide one
+
     Returns:
-    - Dictionary with win, tie, and loss probabilities
+    - Dictionary with win, tie, and loss probabilities, plus the integer
+      win/tie/loss counts and the trial count they came from
     """
-    evaluator = Evaluator()
+    if evaluator is None:
+        evaluator = _EVALUATOR
     wins = 0
     ties = 0
-    
-    for _ in range(num_simulations):
-        # Create a new deck for each simulation
-        deck = Deck()
-        
-        # Remove hole cards and known board cards from the deck
-        for card in hole_cards + board_cards:
-            if card is not None:
-                deck.cards.remove(card)
-        
-        # Complete the board if needed
-        current_board = [c for c in board_cards if c is not None]
-        remaining_board = 5 - len(current_board)
-        
-        if remaining_board > 0:
-            current_board += deck.draw(remaining_board)
-        
-        # Deal cards to opponents
-        opponents_hole_cards = []
-        for _ in range(num_opponents):
-            opponents_hole_cards.append(deck.draw(2))
-        
+
+    # Cards that can no longer appear in a deal
+    known_cards = [c for c in hole_cards + board_cards if c is not None]
+    current_board = [c for c in board_cards if c is not None]
+    remaining_board = 5 - len(current_board)
+
+    remaining = _FULL_DECK[np.isin(_FULL_DECK, known_cards, invert=True)]
+
+    # At the river against one opponent the outcome space is tiny
+    # (C(45, 2) = 990 matchups), so enumerate it exactly instead of
+    # sampling: cheaper than the requested trial count and noise-free
+    if remaining_board == 0 and num_opponents == 1:
+        return _exact_river_heads_up(hole_cards, current_board, remaining, evaluator)
+
+    # Deal all simulations at once: each row is an independent shuffle of the
+    # remaining deck, of which only the first `needed` cards are used
+    needed = remaining_board + 2 * num_opponents
+    rng = np.random.default_rng(seed)
+    deals = np.tile(remaining, (num_simulations, 1))
+    rng.permuted(deals, axis=1, out=deals)  # Shuffle rows in place, no second buffer
+    deals = deals[:, :needed]
+
+    # With a complete board the hero's hand never changes, so score it once
+    if remaining_board == 0:
+        fixed_player_score = evaluator.evaluate(current_board, hole_cards)
+
+    # Bind the bound method once; the attribute lookup is otherwise repeated
+    # num_simulations * (num_opponents + 1) times in the hot loop
+    evaluate = evaluator.evaluate
+
+    # Per-simulation buffers and slice arithmetic, hoisted out of the loop so
+    # each iteration only fills them instead of reallocating
+    opponent_scores = np.empty(num_opponents)
+    opponent_slices = [slice(remaining_board + 2 * k, remaining_board + 2 * k + 2)
+                       for k in range(num_opponents)]
+
+    for deal in deals:
+        deal = deal.tolist()
+
         # Evaluate hands
-        player_score = evaluator.evaluate(current_board, hole_cards)
-        opponent_scores = [evaluator.evaluate(current_board, opp_cards) for opp_cards in opponents_hole_cards]
-        
-        # In treys, lower score is better
-        if all(player_score < score for score in opponent_scores):
+        if remaining_board > 0:
+            board = current_board + deal[:remaining_board]
+            player_score = evaluate(board, hole_cards)
+        else:
+            board = current_board
+            player_score = fixed_player_score
+        for k, hole_slice in enumerate(opponent_slices):
+            opponent_scores[k] = evaluate(board, deal[hole_slice])
+
+        # In treys, lower score is better: beating the best opponent beats
+        # them all, so one C-level min reduction replaces the generator
+        # scans (initial= keeps the degenerate zero-opponent case a win)
+        best_opponent = opponent_scores.min(initial=np.inf)
+        if player_score < best_opponent:
             wins += 1
-        elif any(player_score == score for score in opponent_scores):
+        elif player_score == best_opponent:
             ties += 1
     
     win_prob = wins / num_simulations
@@ -156,5 +269,9 @@ def monte_carlo_simulation(hole_cards, board_cards, num_opponents, num_simulatio
     return {
         'win': win_prob,
         'tie': tie_prob,
-        'loss': loss_prob
+        'loss': loss_prob,
+        'win_count': wins,
+        'tie_count': ties,
+        'loss_count': num_simulations - wins - ties,
+        'simulations': num_simulations
     }
@@ -0,0 +1,70 @@
+import os
+import pickle
+
+from utils.heatmap_utils import (load_range_data,
+                                 POSITIONS, ACTIONS, OPPONENT_TYPES)
+
+# Precomputed quiz answer table, built by scripts/build_quiz_table.py
+QUIZ_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets", "quiz_answers.pkl"
+)
+
+def get_correct_answer(action, frequency):
+    """
+    Determine the correct quiz answer for an action frequency
+
+    Parameters:
+    - action: Action type (Open, Call, 3Bet)
+    - frequency: Action frequency (0-1)
+
+    Returns:
+    - One of "Raise/Bet", "Call", "Fold"
+    """
+    if action == "Open" or action == "3Bet":
+        if frequency >= 0.7:
+            return "Raise/Bet"
+        elif frequency >= 0.3:
+            return "Call"  # Mixed strategy
+        else:
+            return "Fold"
+    else:  # Call
+        if frequency >= 0.3:
+            return "Call"
+        else:
+            return "Fold"
+
+def build_quiz_table():
+    """
+    Build the full quiz answer table for every scenario and hand cell
+
+    Returns:
+    - Dict mapping (position, action, opponent_type, row, col) to
+      (correct_answer, frequency), with 0-based matrix cells as in
+      HAND_TO_CELL
+    """
+    table = {}
+    for position in POSITIONS:
+        for action in ACTIONS:
+            for opponent_type in OPPONENT_TYPES:
+                range_data = load_range_data(position, action, opponent_type)
+                for row in range(13):
+                    for col in range(13):
+                        frequency = range_data[row, col]
+                        table[(position, action, opponent_type, row, col)] = (
+                            get_correct_answer(action, frequency), frequency
+                        )
+    return table
+
+def load_quiz_table():
+    """
+    Load the precomputed quiz answer table, building it if the asset is missing
+
+    Returns:
+    - Dict mapping (position, action, opponent_type, row, col) to
+      (correct_answer, frequency)
+    """
+    if os.path.exists(QUIZ_TABLE_PATH):
+        with open(QUIZ_TABLE_PATH, "rb") as f:
+            return pickle.load(f)
+    return build_quiz_table()
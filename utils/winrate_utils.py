@@ -1,8 +1,139 @@
-import pandas as pd
+import functools
+import os
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import plotly.graph_objects as go
-from treys import Card, Evaluator, Deck
-from utils.poker_utils import card_to_treys, treys_to_card, monte_carlo_simulation
+from utils.poker_utils import card_to_treys, treys_to_card, monte_carlo_simulation, RANK_MAP
+
+# Below this many simulations the process-pool startup outweighs the speedup
+_MIN_PARALLEL_SIMULATIONS = 4000
+
+def _mc_chunk(args):
+    """Run one Monte Carlo chunk in a worker process (must be picklable)"""
+    hole_cards, board_cards, num_opponents, num_simulations, seed = args
+    return monte_carlo_simulation(hole_cards, board_cards, num_opponents,
+                                  num_simulations, seed=seed)
+
+def _run_monte_carlo(hole_cards, board_cards, num_opponents, num_simulations, evaluator=None):
+    """
+    Dispatch the Monte Carlo simulation, splitting trials across CPU cores
+    when the request is large enough to amortize the pool startup
+
+    The optional evaluator override only applies on the serial path; pool
+    workers fall back to the module-wide instance their own import built
+    rather than pickling the lookup tables.
+
+    Returns the same probability dictionary as monte_carlo_simulation.
+    """
+    # A complete board against one opponent is enumerated exactly (990
+    # matchups) inside monte_carlo_simulation; never worth a process pool
+    if num_opponents == 1 and len(board_cards) == 5:
+        return monte_carlo_simulation(hole_cards, board_cards, num_opponents, num_simulations,
+                                      evaluator=evaluator)
+
+    num_workers = os.cpu_count() or 1
+    if num_workers < 2 or num_simulations < _MIN_PARALLEL_SIMULATIONS:
+        return monte_carlo_simulation(hole_cards, board_cards, num_opponents, num_simulations,
+                                      evaluator=evaluator)
+
+    # Distribute trials as evenly as possible and seed each worker
+    # independently from one SeedSequence
+    base, extra = divmod(num_simulations, num_workers)
+    chunk_sizes = [base + (1 if i < extra else 0) for i in range(num_workers)]
+    seeds = np.random.SeedSequence().spawn(num_workers)
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        results = list(executor.map(_mc_chunk, [
+            (hole_cards, board_cards, num_opponents, n, seed)
+            for n, seed in zip(chunk_sizes, seeds)
+        ]))
+
+    # Combine the per-chunk integer counts: summing counts and dividing
+    # once is exact, unlike re-weighting the per-chunk probabilities
+    wins = sum(r['win_count'] for r in results)
+    ties = sum(r['tie_count'] for r in results)
+    win = wins / num_simulations
+    tie = ties / num_simulations
+
+    return {
+        'win': win,
+        'tie': tie,
+        'loss': 1 - win - tie,
+        'win_count': wins,
+        'tie_count': ties,
+        'loss_count': num_simulations - wins - ties,
+        'simulations': num_simulations
+    }
+
+_CANONICAL_SUITS = ('♠', '♥', '♦', '♣')
+
+# Suit bit positions for the card-dedup mask in validate_cards
+SUIT_IDX = {'♠': 0, '♥': 1, '♦': 2, '♣': 3}
+
+def _canonicalize(hole_cards, board_cards):
+    """Collapse suit isomorphisms into one canonical key
+
+    Relabels suits in order of first appearance over the rank-sorted cards,
+    so e.g. A♠K♥ and A♥K♠ (with matching board symmetry) share a key. Equity
+    is suit-symmetric, which makes the relabeled inputs interchangeable.
+
+    Returns (hole_key, board_key) tuples of treys card ints.
+    """
+    relabel = {}
+
+    def canon(card):
+        rank, suit = treys_to_card(card)
+        if suit not in relabel:
+            relabel[suit] = _CANONICAL_SUITS[len(relabel)]
+        return card_to_treys(rank, relabel[suit])
+
+    def by_rank(card):
+        return RANK_MAP.get(treys_to_card(card)[0], 0)
+
+    hole = sorted(hole_cards, key=by_rank, reverse=True)
+    board = sorted(board_cards, key=by_rank, reverse=True)
+    return tuple(canon(c) for c in hole), tuple(canon(c) for c in board)
+
+@functools.lru_cache(maxsize=4096)
+def _cached_win_rate(hole_key, board_key, num_opponents, num_simulations, evaluator):
+    """Serve repeated equity queries for isomorphic inputs from cache"""
+    return _run_monte_carlo(list(hole_key), list(board_key), num_opponents,
+                            num_simulations, evaluator=evaluator)
+
+# Binary snapshot of preflop equities built offline by
+# scripts/build_preflop_table.py: shape (13, 13, 9, 2) float32, holding the
+# win and tie probability for each of the 169 starting-hand buckets against
+# 1-9 opponents. Preflop equity depends only on the bucket, so when the
+# snapshot exists an empty-board query is a single table read instead of a
+# Monte Carlo run. The app falls back to simulation when it is missing
+PREFLOP_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets", "preflop_equity.npy"
+)
+
+_preflop_table = None
+
+def _load_preflop_table():
+    """Lazily load the preflop equity snapshot, or None if it is missing"""
+    global _preflop_table
+    if _preflop_table is None and os.path.exists(PREFLOP_TABLE_PATH):
+        _preflop_table = np.load(PREFLOP_TABLE_PATH)
+    return _preflop_table
+
+def preflop_cell(card1_rank, card1_suit, card2_rank, card2_suit):
+    """Map a starting hand to its bucket in the preflop equity table
+
+    Suited hands occupy one triangle of the 13x13 grid, offsuit hands the
+    other, pairs the diagonal - the same layout as the range matrices.
+
+    Returns (row, col) indices into the table.
+    """
+    hi, lo = sorted((RANK_MAP[card1_rank], RANK_MAP[card2_rank]), reverse=True)
+    if card1_suit == card2_suit and hi != lo:
+        return hi - 2, lo - 2  # Suited
+    return lo - 2, hi - 2  # Pair or offsuit
 
 def validate_cards(card1_rank, card1_suit, card2_rank, card2_suit, board_cards):
     """
@@ -16,29 +147,22 @@ def validate_cards(card1_rank, card1_suit, card2_rank, card2_suit, board_cards):
     Returns:
     - (is_valid, error_message)
     """
-    # Convert to string representation for comparison
-    cards = []
-    
-    # Add hole cards
-    if card1_rank and card1_suit:
-        cards.append(f"{card1_rank}{card1_suit}")
-    
-    if card2_rank and card2_suit:
-        cards.append(f"{card2_rank}{card2_suit}")
-    
-    # Add board cards
-    for rank, suit in board_cards:
+    # Each card owns one bit of a 52-bit mask; a duplicate is simply a bit
+    # that is already set. No string formatting or set construction needed
+    mask = 0
+    for rank, suit in ((card1_rank, card1_suit), (card2_rank, card2_suit),
+                       *board_cards):
         if rank and suit:
-            cards.append(f"{rank}{suit}")
-    
-    # Check for duplicates
-    if len(cards) != len(set(cards)):
-        return False, "同じカードが複数選択されています。すべてのカードは一意である必要があります。"
+            bit = 1 << ((RANK_MAP[rank] - 2) * 4 + SUIT_IDX[suit])
+            if mask & bit:
+                return False, "同じカードが複数選択されています。すべてのカードは一意である必要があります。"
+            mask |= bit
     
     return True, ""
 
 def calculate_win_rate(card1_rank, card1_suit, card2_rank, card2_suit, 
-                      board_ranks, board_suits, num_opponents, num_simulations):
+                      board_ranks, board_suits, num_opponents, num_simulations,
+                      evaluator=None):
     """
     Calculate win rate using Monte Carlo simulation
     
@@ -48,6 +172,7 @@ def calculate_win_rate(card1_rank, card1_suit, card2_rank, card2_suit,
     - board_ranks, board_suits: Lists of ranks and suits for board cards
     - num_opponents: Number of opponents
     - num_simulations: Number of simulations to run
+    - evaluator: Optional shared treys Evaluator to reuse across calls
     
     Returns:
     - Dictionary with win, tie, and loss probabilities
@@ -64,20 +189,22 @@ def calculate_win_rate(card1_rank, card1_suit, card2_rank, card2_suit,
             'error': "ホールカードが正しく指定されていません。"
         }
     
-    # Convert board cards to treys format
+    # Build the board in one pass: treys ints for the simulation and
+    # (rank, suit) tuples for validation
     board_cards = []
-    for i in range(len(board_ranks)):
-        if board_ranks[i] and board_suits[i]:
-            card = card_to_treys(board_ranks[i], board_suits[i])
+    board_tuples = []
+    board_parts = []
+    for rank, suit in zip(board_ranks, board_suits):
+        if rank and suit:
+            card = card_to_treys(rank, suit)
             if card:
                 board_cards.append(card)
+            board_tuples.append((rank, suit))
+            board_parts.append(f"{rank}{suit}")
     
     # Validate all cards are unique
-    all_cards = [(card1_rank, card1_suit), (card2_rank, card2_suit)]
-    all_cards.extend([(board_ranks[i], board_suits[i]) for i in range(len(board_ranks)) if board_ranks[i] and board_suits[i]])
-    
     is_valid, error_message = validate_cards(card1_rank, card1_suit, card2_rank, card2_suit, 
-                                           [(board_ranks[i], board_suits[i]) for i in range(len(board_ranks)) if board_ranks[i] and board_suits[i]])
+                                           board_tuples)
     
     if not is_valid:
         return {
@@ -87,9 +214,33 @@ def calculate_win_rate(card1_rank, card1_suit, card2_rank, card2_suit,
             'error': error_message
         }
     
-    # Run Monte Carlo simulation
-    result = monte_carlo_simulation([hole_card1, hole_card2], board_cards, num_opponents, num_simulations)
-    
+    # An empty board is one of only 169 strategically distinct situations;
+    # serve it from the precomputed equity table when the snapshot exists
+    if not board_cards:
+        table = _load_preflop_table()
+        if table is not None and 1 <= num_opponents <= table.shape[2]:
+            row, col = preflop_cell(card1_rank, card1_suit, card2_rank, card2_suit)
+            win, tie = table[row, col, num_opponents - 1]
+            win = float(win)
+            tie = float(tie)
+            return {
+                'win': win,
+                'tie': tie,
+                'loss': 1 - win - tie,
+                'board_str': ""
+            }
+
+    # Run Monte Carlo simulation (parallelized across cores for large runs),
+    # caching results under a suit-canonical key so isomorphic inputs reuse
+    # the previous answer
+    hole_key, board_key = _canonicalize([hole_card1, hole_card2], board_cards)
+    result = _cached_win_rate(hole_key, board_key, num_opponents, num_simulations, evaluator)
+
+    # Attach the display string for the board as entered (the cached dict is
+    # shared between isomorphic queries, so annotate a copy)
+    result = dict(result)
+    result['board_str'] = " ".join(board_parts)
+
     return result
 
 def create_win_rate_chart(win_rate_data):
@@ -102,8 +253,20 @@ def create_win_rate_chart(win_rate_data):
     Returns:
     - Plotly figure object
     """
+    return _win_rate_figure(win_rate_data['win'], win_rate_data['tie'],
+                            win_rate_data['loss'])
+
+@functools.lru_cache(maxsize=64)
+def _win_rate_figure(win, tie, loss):
+    """Build (or reuse) the pie figure for one win/tie/loss split
+
+    Copying a prebuilt template figure is no faster than construction in
+    Plotly (figures copy via full serialization), but win-rate results are
+    themselves cached and recur exactly, so memoizing whole figures skips
+    the rebuild and its schema validation on every repeated result.
+    """
     labels = ['勝ち', '引き分け', '負け']
-    values = [win_rate_data['win'], win_rate_data['tie'], win_rate_data['loss']]
+    values = [win, tie, loss]
     colors = ['rgb(100, 200, 100)', 'rgb(200, 200, 100)', 'rgb(200, 100, 100)']
     
     fig = go.Figure(data=[go.Pie(
@@ -136,38 +299,46 @@ def get_win_rate_description(win_rate_data, card1_rank, card1_suit, card2_rank,
     - card2_rank, card2_suit: Second hole card
     - num_opponents: Number of opponents
     - board_cards: Optional list of (rank, suit) tuples for board cards
-    
+      (fallback when win_rate_data has no cached 'board_str')
+
     Returns:
     - Description string
     """
     hand_type = f"{card1_rank}{card1_suit} {card2_rank}{card2_suit}"
-    
+
     if 'error' in win_rate_data and win_rate_data['error']:
         return f"エラー: {win_rate_data['error']}"
-    
+
     win_pct = win_rate_data['win'] * 100
     tie_pct = win_rate_data['tie'] * 100
-    
-    if board_cards and any(board_cards):
-        board_str = " ".join([f"{rank}{suit}" for rank, suit in board_cards if rank and suit])
+
+    # calculate_win_rate already joined the board while building it; only
+    # re-scan board_cards for callers that pass a bare result dict
+    board_str = win_rate_data.get('board_str')
+    if board_str is None and board_cards:
+        board_str = " ".join(f"{rank}{suit}" for rank, suit in board_cards if rank and suit)
+
+    if board_str:
         description = f"ハンド **{hand_type}** は、ボード **{board_str}** で **{num_opponents}人** の相手に対して **{win_pct:.1f}%** の勝率があります。"
     else:
         description = f"ハンド **{hand_type}** は、**{num_opponents}人** の相手に対して **{win_pct:.1f}%** の勝率があります。"
     
-    # Add interpretation
-    if win_pct >= 80:
-        description += "\n\n**非常に強い**ハンドです。積極的にプレイすべきです。"
-    elif win_pct >= 60:
-        description += "\n\n**強い**ハンドです。通常はレイズやベットを検討すべきです。"
-    elif win_pct >= 45:
-        description += "\n\n**平均的な強さ**のハンドです。状況に応じてプレイを判断しましょう。"
-    elif win_pct >= 30:
-        description += "\n\n**弱い**ハンドです。慎重にプレイし、良いオッズがある場合のみ継続を検討しましょう。"
-    else:
-        description += "\n\n**非常に弱い**ハンドです。通常はフォールドを検討すべきです。"
+    # Add interpretation via the shared threshold table
+    description += _INTERPRETATIONS[bisect_right(_INTERPRETATION_THRESHOLDS, win_pct)]
     
     return description
 
+# Interpretation texts from weakest to strongest; entry i applies when the
+# win percentage sits between thresholds i-1 and i
+_INTERPRETATION_THRESHOLDS = (30, 45, 60, 80)
+_INTERPRETATIONS = (
+    "\n\n**非常に弱い**ハンドです。通常はフォールドを検討すべきです。",
+    "\n\n**弱い**ハンドです。慎重にプレイし、良いオッズがある場合のみ継続を検討しましょう。",
+    "\n\n**平均的な強さ**のハンドです。状況に応じてプレイを判断しましょう。",
+    "\n\n**強い**ハンドです。通常はレイズやベットを検討すべきです。",
+    "\n\n**非常に強い**ハンドです。積極的にプレイすべきです。",
+)
+
 def get_hand_strength_category(win_rate):
     """
     Get a category description based on win rate
@@ -178,15 +349,15 @@ def get_hand_strength_category(win_rate):
     Returns:
     - Category string
     """
-    if win_rate >= 0.8:
-        return "モンスターハンド"
-    elif win_rate >= 0.65:
-        return "プレミアムハンド"
-    elif win_rate >= 0.5:
-        return "強いハンド"
-    elif win_rate >= 0.4:
-        return "平均的なハンド"
-    elif win_rate >= 0.3:
-        return "弱いハンド"
-    else:
-        return "非常に弱いハンド"
+    return _STRENGTH_CATEGORIES[bisect_right(_STRENGTH_THRESHOLDS, win_rate)]
+
+# Categories from weakest to strongest, indexed like the interpretations
+_STRENGTH_THRESHOLDS = (0.3, 0.4, 0.5, 0.65, 0.8)
+_STRENGTH_CATEGORIES = (
+    "非常に弱いハンド",
+    "弱いハンド",
+    "平均的なハンド",
+    "強いハンド",
+    "プレミアムハンド",
+    "モンスターハンド",
+)